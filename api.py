@@ -1,19 +1,23 @@
 import requests
-import json
+import time
+from urllib.parse import urlparse
 from config import HEADERS
+from metrics import record_upstream
+from profiling import stage
+from serialization import loads
 
 # Helper function to make HTTP requests and handle errors
 def fetch_data_from_api(url, query_params=None):
+    endpoint = urlparse(url).path
+    start = time.perf_counter()
     try:
-        response = requests.get(url, headers=HEADERS, params=query_params)
-        response.raise_for_status()  # Raise an HTTPError for bad responses
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        with stage(f"upstream {endpoint}"):
+            response = requests.get(url, headers=HEADERS, params=query_params)
+            response.raise_for_status()  # Raise an HTTPError for bad responses
+            data = loads(response.content)
+        record_upstream(endpoint, 'ok', time.perf_counter() - start)
+        return data
+    except (requests.exceptions.RequestException, ValueError) as e:  # ValueError: malformed JSON body
+        record_upstream(endpoint, 'error', time.perf_counter() - start)
         print(f"Error fetching data: {e}")
         return None
-
-
-def load_team_data(file_name, team):
-    with open(file_name, 'r') as file:
-        data = json.load(file)
-    return next((entry for entry in data if entry['id'] == team), None)
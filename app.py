@@ -6,24 +6,45 @@ from config import PORT
 from callbacks import register_callbacks
 from cache_config import cache
 from layout import main_layout
+from metrics import init_metrics
+from profiling import init_profiling
+from serialization import init_serialization
+from responses import init_responses
+from logos import init_logos
+from shared import init_shared, first_boot
+from warmstart import init_warmstart
+from jobs import job_manager
+from static_weeks import init_static_weeks
 
 
 # Initialize Flask server
 server = Flask(__name__)
 # Initialize Dash app with Flask server
 app = dash.Dash(__name__, server=server, external_stylesheets=[dbc.themes.BOOTSTRAP],
-                suppress_callback_exceptions=True, title="CFB Games")
+                suppress_callback_exceptions=True, title="CFB Games",
+                background_callback_manager=job_manager)
 
 # Initialize cache and clear
 cache.init_app(app.server)
-with app.server.app_context():
-   cache.clear()
+init_metrics(app.server)
+init_logos(app.server)
+init_shared(app.server)
+init_serialization(app.server)
+init_profiling(app.server)  # After serialization so it times the serializer in use
+init_responses(app.server)  # Registered last so it runs first and metrics see compressed sizes
+# Once per boot, by the first worker to start; a respawned worker's clear would drop the live
+# cache mid-day, and a later worker's would drop what the warm start restored
+if first_boot():
+    with app.server.app_context():
+        cache.clear()
+init_warmstart(app.server)  # Restores computed state cleared above before serving traffic
 
 # Set up the app layout with navigation and page container
 app.layout = main_layout
 
 # Register callbacks
 register_callbacks(app)
+init_static_weeks(app)  # After the callbacks it renders and answers for
 
 # Run Dash server
 if __name__ == "__main__":
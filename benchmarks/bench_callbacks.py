@@ -0,0 +1,137 @@
+# benchmarks/bench_callbacks.py
+# Microbenchmarks for the callback pipeline against the local stub API.
+#   python -m benchmarks.bench_callbacks [--repeat 20] [--baseline benchmarks/results/<sha>.json]
+# Results are written per commit to benchmarks/results/<sha>.json so runs can be compared.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from benchmarks.fixtures import REGULAR_WEEK, BOWL_WEEK
+from benchmarks.stub_api import start_stub
+
+_stub, _base_url = start_stub()
+os.environ['API_BASE_URL'] = _base_url
+# Fresh archive and shared snapshots per run so completed-week reads are measured the same way every time
+_run_dir = tempfile.mkdtemp(prefix='cfb-bench-')
+os.environ['ARCHIVE_PATH'] = os.path.join(_run_dir, 'archive.sqlite3')
+os.environ['SHARED_DIR'] = os.path.join(_run_dir, 'shared')
+os.environ['WARM_SNAPSHOT_PATH'] = ''  # Always measure from a cold cache
+os.environ['STATIC_WEEKS_DIR'] = ''  # Measures the callbacks, not pre-rendered weeks
+
+import app  # noqa: E402  (must import after API_BASE_URL points at the stub)
+from cache_config import cache  # noqa: E402
+from callbacks import register_callbacks  # noqa: E402
+from utils import display_matchup, display_results  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+SCENARIOS = {
+    'regular': ('regular', REGULAR_WEEK),
+    'bowl': ('postseason', BOWL_WEEK),
+}
+
+
+class CallbackCollector:
+    # Stands in for the Dash app so the real callback functions can be called directly
+    def __init__(self):
+        self.callbacks = {}
+
+    def callback(self, *args, **kwargs):
+        def decorator(func):
+            self.callbacks[func.__name__] = func
+            return func
+        return decorator
+
+    def clientside_callback(self, *args, **kwargs):
+        pass  # Runs in the browser; nothing to measure server-side
+
+
+def collect_callbacks():
+    collector = CallbackCollector()
+    register_callbacks(collector)
+    return collector.callbacks
+
+
+def measure(func, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'min_ms': round(timings[0], 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'repeat': repeat,
+    }
+
+
+def run(repeat):
+    callbacks = collect_callbacks()
+    results = {}
+    with app.server.app_context():
+        for scenario, (season_type, week) in SCENARIOS.items():
+            _stub.RequestHandlerClass.season_type = season_type
+            cache.clear()
+            games = callbacks['create_display'](week)
+            if not games:
+                print(f"Skipping {scenario}: no games in fixtures")
+                continue
+            completed = next((game for game in games if game['completed']), games[0])
+            cases = {
+                'create_display.cold': (lambda: callbacks['create_display'](week), cache.clear),
+                'create_display.warm': (lambda: callbacks['create_display'](week), None),
+                'display_static_items.cold': (lambda: callbacks['display_static_items'](week), cache.clear),
+                'display_static_items.warm': (lambda: callbacks['display_static_items'](week), None),
+                'display_matchup': (lambda: display_matchup(games[0]), None),
+                'display_results': (lambda: display_results(week, completed), None),
+                'update_game_data': (lambda: callbacks['update_game_data'](1, True, []), None),
+            }
+            for name, (func, setup) in cases.items():
+                results[f"{scenario}.{name}"] = measure(func, repeat, setup)
+                print(f"{scenario}.{name:28} median {results[f'{scenario}.{name}']['median_ms']:>9.3f} ms")
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results, baseline_file):
+    with open(baseline_file, 'r') as file:
+        baseline = json.load(file)['results']
+    print(f"\nChange vs {baseline_file} (median):")
+    for name, result in results.items():
+        if name in baseline and baseline[name]['median_ms']:
+            change = (result['median_ms'] - baseline[name]['median_ms']) / baseline[name]['median_ms'] * 100
+            print(f"{name:40} {change:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark callback functions against the stub API")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help="Results file (default: benchmarks/results/<git sha>.json)")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    revision = git_revision()
+    output = args.output or os.path.join(RESULTS_DIR, f"{revision}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as file:
+        json.dump({'revision': revision, 'timestamp': time.time(), 'results': results}, file, indent=2)
+    print(f"\nWrote {output}")
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
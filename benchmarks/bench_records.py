@@ -0,0 +1,208 @@
+# benchmarks/bench_records.py
+# Memory and throughput of the week pipeline at 800 games: the slotted records from records.py
+# against the dict pipeline they replaced (kept below as the reference). Raw upstream responses
+# are the regular-week fixtures replicated to the requested number of games.
+# Measured at 800 games, both pipelines using the same joins:
+# - records build a little faster (4.8 -> 4.1 ms) and a worker keeps 295 instead of 736 KiB per
+#   memoized week (peak 2217 -> 804 KiB)
+# - converted to dicts for Dash they gain nothing: 740 KiB retained and slower (6.0 ms)
+# - pickled into the cache they are larger (143 vs 136 KiB)
+# - scoreboard entries take 119 instead of 364 KiB but are slower to build (0.6 -> 1.1 ms)
+#   python -m benchmarks.bench_records [--games 800] [--repeat 10]
+import argparse
+import inspect
+import pickle
+import time
+import tracemalloc
+from benchmarks.bench_callbacks import app
+from benchmarks.fixtures import REGULAR_WEEK, fixture_name, load_fixture
+from records import Line, Media
+from timezones import to_timestamp
+import utils
+
+
+# --- Reference: the dict pipeline before records.py, with the same id/school joins as
+# join_week_data so the comparison measures the representation, not the lookups ---
+
+def dict_lines(response):
+    return [{'id': game['id'], 'spread': line['formattedSpread'], 'over_under': line['overUnder']}
+            for game in response for line in game.get('lines', []) if line.get('provider') == 'ESPN Bet']
+
+
+def dict_media(response):
+    consolidated_media = {}
+    for item in response:
+        consolidated_media.setdefault(item['id'], []).append(item['outlet'])
+    return [{'id': k, 'outlet': ', '.join(v)} for k, v in consolidated_media.items()]
+
+
+def dict_records(records):
+    return [{'team': record['team'],
+             'Total Wins': record['total'].get('wins', 0), 'Total Losses': record['total'].get('losses', 0),
+             'Conference Wins': record['conferenceGames'].get('wins', 0),
+             'Conference Losses': record['conferenceGames'].get('losses', 0)}
+            for record in records]
+
+
+def dict_clean_games(games):
+    return [{'id': game['id'], 'start_timestamp': to_timestamp(game['start_date']),
+             'home_team': game['home_team'], 'home_id': game['home_id'],
+             'away_team': game['away_team'], 'away_id': game['away_id'],
+             'home_points': game['home_points'], 'home_line_scores': game['home_line_scores'],
+             'away_points': game['away_points'], 'completed': game['completed']}
+            for game in games]
+
+
+def dict_home_away_teams(games):
+    team_data_by_school = {team['school']: team for team in utils.get_logos_colors()}
+    missing = {'mascot': 'N/A', 'logo': "N/A", 'color': "#ffffff", 'alt_color': "#ffffff"}
+    games_with_logos = []
+    for game in games:
+        home, away = team_data_by_school.get(game['home_team'], missing), team_data_by_school.get(game['away_team'], missing)
+        games_with_logos.append({
+            **game,
+            'home_team_mascot': home['mascot'], 'away_team_mascot': away['mascot'],
+            'home_team_logo': home['logo'], 'away_team_logo': away['logo'],
+            'home_team_color': home['color'], 'away_team_color': away['color'],
+            'home_team_alt_color': home['alt_color'],
+        })
+    return games_with_logos
+
+
+def dict_pipeline(raw):
+    games_with_teams = dict_home_away_teams(dict_clean_games(raw['games']))
+    lines_by_id = {bet['id']: bet for bet in dict_lines(raw['lines'])}
+    media_by_id = {media['id']: media for media in dict_media(raw['media'])}
+    games_with_betting = []
+    for game in games_with_teams:
+        betting_info = lines_by_id.get(game['id'])
+        game_with_betting = {**game}
+        game_with_betting.update({'spread': betting_info['spread'], 'over_under': betting_info['over_under']}
+                                 if betting_info else {'spread': 'N/A', 'over_under': 'N/A'})
+        games_with_betting.append(game_with_betting)
+    games_with_media = []
+    for game in games_with_betting:
+        media_info = media_by_id.get(game['id'])
+        games_with_media.append({**game, 'outlet': media_info['outlet'] if media_info else "N/A"})
+    records_by_name = {record['team']: record for record in dict_records(raw['records'])}
+    missing = {'Total Wins': 'N/A', 'Total Losses': 'N/A', 'Conference Wins': 'N/A', 'Conference Losses': 'N/A'}
+    games_with_records = []
+    for game in games_with_media:
+        home, away = records_by_name.get(game['home_team'], missing), records_by_name.get(game['away_team'], missing)
+        games_with_records.append({
+            **game,
+            'home_total_wins': home['Total Wins'], 'home_total_losses': home['Total Losses'],
+            'home_conference_wins': home['Conference Wins'], 'home_conference_losses': home['Conference Losses'],
+            'away_total_wins': away['Total Wins'], 'away_total_losses': away['Total Losses'],
+            'away_conference_wins': away['Conference Wins'], 'away_conference_losses': away['Conference Losses'],
+        })
+    return games_with_records
+
+
+def dict_scoreboard(scoreboard):
+    return [{'game_id': game['id'], 'home_id': game['homeTeam']['id'], 'away_id': game['awayTeam']['id'],
+             'home_team': game['homeTeam']['name'], 'away_team': game['awayTeam']['name'],
+             'status': game['status'], 'period': game['period'], 'clock': game['clock'], 'tv': game['tv'],
+             'situation': game.get('situation'), 'possession': game['possession'],
+             'home_team_score': game['homeTeam']['points'], 'away_team_score': game['awayTeam']['points'],
+             'spread': game['betting']['spread']}
+            for game in scoreboard]
+
+
+# --- The record pipeline, as get_week_games runs it minus fetching and memoization ---
+
+clean_games = inspect.unwrap(utils.clean_games)
+create_home_away_teams = inspect.unwrap(utils.create_home_away_teams)
+create_records = inspect.unwrap(utils.create_records)
+
+
+def record_pipeline(raw):
+    games = create_home_away_teams(clean_games(raw['games']))
+    lines = [Line(id=game['id'], spread=line['formattedSpread'], over_under=line['overUnder'])
+             for game in raw['lines'] for line in game.get('lines', []) if line.get('provider') == 'ESPN Bet']
+    media = [Media(id=item['id'], outlet=item['outlet']) for item in dict_media(raw['media'])]
+    return utils.join_week_data(games, lines, media, create_records(raw['records']))
+
+
+def record_scoreboard(scoreboard):
+    # create_scoreboard reads the shared snapshot; feed it the replicated scoreboard instead
+    original = utils.get_scoreboard
+    utils.get_scoreboard = lambda: scoreboard
+    try:
+        return utils.create_scoreboard()
+    finally:
+        utils.get_scoreboard = original
+
+
+# --- Harness ---
+
+def replicate(games_wanted):
+    # Regular-week responses cycled to `games_wanted` games with fresh ids
+    base = {name: load_fixture(fixture_name(name, REGULAR_WEEK)) for name in ('games', 'lines', 'media')}
+    scoreboard = load_fixture(fixture_name('scoreboard'))
+    raw = {'games': [], 'lines': [], 'media': [], 'scoreboard': [], 'records': load_fixture(fixture_name('records'))}
+    lines_by_id = {line['id']: line for line in base['lines']}
+    media_by_id = {}
+    for item in base['media']:
+        media_by_id.setdefault(item['id'], []).append(item)
+    scoreboard_by_id = {game['id']: game for game in scoreboard}
+    for index in range(games_wanted):
+        game = base['games'][index % len(base['games'])]
+        game_id = 500000000 + index
+        raw['games'].append({**game, 'id': game_id})
+        if game['id'] in lines_by_id:
+            raw['lines'].append({**lines_by_id[game['id']], 'id': game_id})
+        raw['media'].extend({**item, 'id': game_id} for item in media_by_id.get(game['id'], []))
+        if game['id'] in scoreboard_by_id:
+            raw['scoreboard'].append({**scoreboard_by_id[game['id']], 'id': game_id})
+    return raw
+
+
+def best_ms(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def retained_kib(func):
+    # Memory still allocated once the result is built (what a worker holds per week), and the peak
+    tracemalloc.start()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 1024, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record vs dict week pipeline at scale")
+    parser.add_argument('--games', type=int, default=800)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+    raw = replicate(args.games)
+
+    with app.server.app_context():
+        utils.get_logos_colors()  # Warm, as it is in the app
+        rows = [
+            ('week pipeline', lambda: dict_pipeline(raw), lambda: record_pipeline(raw)),
+            ('week pipeline + to_dict', lambda: dict_pipeline(raw),
+             lambda: [game.to_dict() for game in record_pipeline(raw)]),
+            ('scoreboard', lambda: dict_scoreboard(raw['scoreboard']), lambda: record_scoreboard(raw['scoreboard'])),
+        ]
+        print(f"{args.games} games, {len(raw['scoreboard'])} scoreboard entries\n")
+        print(f"{'stage':26} {'dict ms':>9} {'record ms':>10} {'dict KiB':>9} {'record KiB':>11} "
+              f"{'dict peak':>10} {'record peak':>12} {'dict pickle':>12} {'record pickle':>14}")
+        for name, dict_func, record_func in rows:
+            dict_ms, record_ms = best_ms(dict_func, args.repeat), best_ms(record_func, args.repeat)
+            (dict_kib, dict_peak), (record_kib, record_peak) = retained_kib(dict_func), retained_kib(record_func)
+            dict_pickle = len(pickle.dumps(dict_func(), pickle.HIGHEST_PROTOCOL)) / 1024
+            record_pickle = len(pickle.dumps(record_func(), pickle.HIGHEST_PROTOCOL)) / 1024
+            print(f"{name:26} {dict_ms:>9.2f} {record_ms:>10.2f} {dict_kib:>9.0f} {record_kib:>11.0f} "
+                  f"{dict_peak:>10.0f} {record_peak:>12.0f} {dict_pickle:>12.0f} {record_pickle:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_season_stats.py
+# Cost of the season-stats engine over a full regular season: ingesting one final week, ranking
+# every FBS team (compute) and building the published records, next to the data-file path it
+# replaces (to_numeric over each team's offense and defense rows). Weeks are the regular-week
+# game_stats fixture replayed for every week of the season.
+#   python -m benchmarks.bench_season_stats [--weeks 14] [--repeat 200]
+import argparse
+import time
+from benchmarks.fixtures import REGULAR_WEEK, fixture_name, load_fixture
+from season_stats import SeasonStats, fbs_team_ids
+from utils import load_stats, to_numeric
+
+
+def best_us(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def file_stats(offense, defense):
+    # What get_team_stats did for every team before the engine
+    for stats in (offense, defense):
+        for row in stats.values():
+            {key: to_numeric(row.get(field, 0)) for key, field in (
+                ('total_rank', 'Total_Rank'), ('total_ypg', 'Total_YPG'), ('rush_rank', 'Rushing_Rank'),
+                ('rush_ypg', 'Rushing_YPG'), ('pass_rank', 'Passing_Rank'), ('pass_ypg', 'Passing_YPG'),
+                ('scoring_avg', 'Scoring_PPG'), ('scoring_rank', 'Scoring_Rank'))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Season-stats engine vs data files")
+    parser.add_argument('--weeks', type=int, default=14)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+    game_stats = load_fixture(fixture_name('game_stats', REGULAR_WEEK))
+    engine = SeasonStats(fbs_team_ids())
+    for week in range(1, args.weeks + 1):
+        engine.ingest_week(week, game_stats)
+    offense, defense = load_stats('data/offense_stats.json'), load_stats('data/defense_stats.json')
+
+    print(f"{len(engine.team_ids)} teams, {args.weeks} weeks, {len(game_stats)} games per week\n")
+    print(f"{'stage':34} {'best us':>10}")
+    for name, func in (
+            ('ingest one week', lambda: engine.ingest_week(args.weeks, game_stats)),
+            ('compute averages + ranks', engine.compute),
+            ('records (compute + to lists)', engine.records),
+            ('data files via to_numeric', lambda: file_stats(offense, defense)),
+    ):
+        print(f"{name:34} {best_us(func, args.repeat):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_serialization.py
+# Compares the standard json/pickle paths with the FAST_JSON (orjson) paths for one full-week
+# render: upstream parsing of every weekly response, the games-data store and static-game-info
+# callback bodies, and a dump+load of each memoized value through the cache serializer.
+#   python -m benchmarks.bench_serialization [--repeat 50]
+import argparse
+import io
+import json
+import time
+from dash._utils import to_json
+from cachelib.serializers import FileSystemSerializer
+from benchmarks.bench_callbacks import app, collect_callbacks
+from benchmarks.fixtures import REGULAR_WEEK, WEEKLY_ENDPOINTS, fixture_name, fixture_path
+from serialization import FastCacheSerializer, dash_to_json, orjson
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def cache_roundtrip(serializer, values):
+    for value in values:
+        buffer = io.BytesIO()
+        serializer.dump(value, buffer)
+        buffer.seek(0)
+        serializer.load(buffer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Standard vs orjson serialization for a full-week render")
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+    if orjson is None:
+        raise SystemExit("orjson is not installed")
+
+    bodies = []
+    for name in [fixture_name(endpoint, REGULAR_WEEK) for endpoint in WEEKLY_ENDPOINTS] + \
+                [fixture_name('records'), fixture_name('calendar')]:
+        with open(fixture_path(name), 'rb') as file:
+            bodies.append(file.read())
+
+    callbacks = collect_callbacks()
+    with app.server.app_context():
+        games_data = callbacks['create_display'](REGULAR_WEEK)
+        static_items = callbacks['display_static_items'](REGULAR_WEEK)[0]
+    responses = [{'games-data': {'data': games_data}}, {'static-game-info': {'children': static_items}}]
+    cached_values = [json.loads(body) for body in bodies] + [games_data]
+
+    def render_responses(serialize):
+        for response in responses:
+            serialize(response)
+
+    rows = [
+        ('upstream parse', lambda: [json.loads(body) for body in bodies],
+         lambda: [orjson.loads(body) for body in bodies]),
+        ('callback responses', lambda: render_responses(to_json), lambda: render_responses(dash_to_json)),
+        ('cache dump+load', lambda: cache_roundtrip(FileSystemSerializer(), cached_values),
+         lambda: cache_roundtrip(FastCacheSerializer(), cached_values)),
+    ]
+    payload = sum(len(to_json(response)) for response in responses)
+    print(f"Full-week render: {len(games_data)} games, {payload / 1024:.0f} KiB of callback JSON\n")
+    print(f"{'stage':20} {'standard ms':>12} {'orjson ms':>10} {'speedup':>8}")
+    totals = [0.0, 0.0]
+    for name, standard, fast in rows:
+        standard_ms, fast_ms = best_of(standard, args.repeat), best_of(fast, args.repeat)
+        totals[0] += standard_ms
+        totals[1] += fast_ms
+        print(f"{name:20} {standard_ms:>12.2f} {fast_ms:>10.2f} {standard_ms / fast_ms:>7.1f}x")
+    print(f"{'total':20} {totals[0]:>12.2f} {totals[1]:>10.2f} {totals[0] / totals[1]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
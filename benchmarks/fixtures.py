@@ -0,0 +1,243 @@
+# benchmarks/fixtures.py
+# Upstream fixtures for the stub API. Recorded responses (see record_fixtures.py) live under
+# fixtures/recorded and take precedence; otherwise a deterministic synthetic set with the same
+# shape is generated from data/team_info.json into fixtures/synthetic.
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+RECORDED_DIR = os.path.join(FIXTURES_DIR, 'recorded')
+SYNTHETIC_DIR = os.path.join(FIXTURES_DIR, 'synthetic')
+TEAM_INFO = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'team_info.json')
+
+SEASON = 2024
+# Representative weeks: a full regular-season Saturday and the bowl week
+REGULAR_WEEK = 10
+BOWL_WEEK = 1
+WEEKLY_ENDPOINTS = ('games', 'lines', 'media', 'game_stats')
+SEASON_ENDPOINTS = ('records', 'calendar')
+PROVIDERS = ('ESPN Bet', 'DraftKings', 'Bovada')
+OUTLETS = ('ABC', 'ESPN', 'ESPN2', 'FOX', 'FS1', 'CBS', 'NBC', 'Peacock', 'ESPN+', 'CBSSN', 'BTN', 'SECN')
+
+
+def fixture_name(endpoint, week=None, season_type='regular'):
+    if week is None:
+        return f"{endpoint}.json"
+    return f"{season_type}_week_{week}_{endpoint}.json"
+
+
+def fixture_path(name):
+    recorded = os.path.join(RECORDED_DIR, name)
+    if os.path.exists(recorded):
+        return recorded
+    return os.path.join(SYNTHETIC_DIR, name)
+
+
+def load_fixture(name):
+    path = fixture_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+def save_fixture(directory, name, data):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), 'w') as file:
+        json.dump(data, file)
+
+
+def _iso(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _fbs_teams():
+    with open(TEAM_INFO, 'r') as file:
+        return [team for team in json.load(file) if team.get('classification') == 'fbs']
+
+
+def _line_scores(rng, points, periods=4):
+    scores = [0] * periods
+    for _ in range(points // 7):
+        scores[rng.randrange(periods)] += 7
+    scores[rng.randrange(periods)] += points % 7
+    return scores
+
+
+def _build_week(rng, teams, week, season_type, kickoff_day, game_count):
+    pairs = rng.sample(teams, game_count * 2)
+    games, lines, media, game_stats = [], [], [], []
+    for index in range(game_count):
+        home, away = pairs[index * 2], pairs[index * 2 + 1]
+        game_id = 401600000 + week * 1000 + index + (500 if season_type == 'postseason' else 0)
+        start = kickoff_day + timedelta(hours=16 + (index % 5) * 3, days=-1 if index % 7 == 0 else 0)
+        home_points, away_points = rng.randrange(3, 56), rng.randrange(0, 49)
+        games.append({
+            'id': game_id, 'season': SEASON, 'week': week, 'season_type': season_type,
+            'start_date': _iso(start), 'start_time_tbd': False, 'completed': True,
+            'neutral_site': season_type == 'postseason', 'conference_game': home['conference'] == away['conference'],
+            'attendance': None, 'venue_id': None, 'venue': None,
+            'home_id': home['id'], 'home_team': home['school'], 'home_conference': home['conference'],
+            'home_division': 'fbs', 'home_points': home_points,
+            'home_line_scores': _line_scores(rng, home_points),
+            'home_post_win_prob': None, 'home_pregame_elo': None, 'home_postgame_elo': None,
+            'away_id': away['id'], 'away_team': away['school'], 'away_conference': away['conference'],
+            'away_division': 'fbs', 'away_points': away_points,
+            'away_line_scores': _line_scores(rng, away_points),
+            'away_post_win_prob': None, 'away_pregame_elo': None, 'away_postgame_elo': None,
+            'excitement_index': None, 'highlights': None, 'notes': None,
+        })
+        spread = rng.choice([-1, 1]) * rng.randrange(1, 40) / 2
+        total = rng.randrange(80, 140) / 2
+        lines.append({
+            'id': game_id, 'season': SEASON, 'seasonType': season_type, 'week': week, 'startDate': _iso(start),
+            'homeTeam': home['school'], 'homeConference': home['conference'], 'homeScore': home_points,
+            'awayTeam': away['school'], 'awayConference': away['conference'], 'awayScore': away_points,
+            'lines': [
+                {
+                    'provider': provider,
+                    'spread': spread + offset, 'formattedSpread': f"{home['school']} {spread + offset}",
+                    'spreadOpen': spread, 'overUnder': total + offset, 'overUnderOpen': total,
+                    'homeMoneyline': int(-110 - spread * 20), 'awayMoneyline': int(-110 + spread * 20),
+                }
+                for offset, provider in zip((0, 0.5, -0.5), PROVIDERS)
+            ],
+        })
+        for outlet in rng.sample(OUTLETS, rng.choice((1, 1, 2))):
+            media.append({
+                'id': game_id, 'season': SEASON, 'week': week, 'seasonType': season_type, 'startTime': _iso(start),
+                'isStartTimeTBD': False, 'homeTeam': home['school'], 'homeConference': home['conference'],
+                'awayTeam': away['school'], 'awayConference': away['conference'],
+                'mediaType': 'tv', 'outlet': outlet,
+            })
+        game_stats.append({
+            'id': game_id,
+            'teams': [_team_game_stats(rng, team, side, points)
+                      for team, side, points in ((home, 'home', home_points), (away, 'away', away_points))],
+        })
+    return games, lines, media, game_stats
+
+
+def _team_game_stats(rng, team, side, points):
+    rushing, passing = rng.randrange(40, 300), rng.randrange(80, 420)
+    attempts = rng.randrange(18, 45)
+    possession = rng.randrange(1500, 2100)
+    return {
+        'schoolId': team['id'], 'school': team['school'], 'conference': team['conference'],
+        'homeAway': side, 'points': points,
+        'stats': [{'category': category, 'stat': str(value)} for category, value in (
+            ('totalYards', rushing + passing), ('rushingYards', rushing),
+            ('rushingAttempts', rng.randrange(20, 50)), ('netPassingYards', passing),
+            ('completionAttempts', f"{rng.randrange(10, attempts)}-{attempts}"),
+            ('possessionTime', f"{possession // 60}:{possession % 60:02}"),
+            ('tackles', rng.randrange(30, 90)), ('sacks', rng.randrange(0, 6)),
+            ('qbHurries', rng.randrange(0, 10)), ('turnovers', rng.randrange(0, 4)),
+        )],
+    }
+
+
+def _build_calendar():
+    first = datetime(SEASON, 8, 24, 16, tzinfo=timezone.utc)
+    calendar = [
+        {'season': str(SEASON), 'week': week, 'seasonType': 'regular',
+         'firstGameStart': _iso(first + timedelta(weeks=week - 1)),
+         'lastGameStart': _iso(first + timedelta(weeks=week - 1, days=2))}
+        for week in range(1, 16)
+    ]
+    calendar.append({'season': str(SEASON), 'week': BOWL_WEEK, 'seasonType': 'postseason',
+                     'firstGameStart': _iso(datetime(SEASON, 12, 14, 16, tzinfo=timezone.utc)),
+                     'lastGameStart': _iso(datetime(SEASON + 1, 1, 20, 23, tzinfo=timezone.utc))})
+    return calendar
+
+
+def _build_records(teams, games):
+    totals = {team['school']: {'total': [0, 0], 'conference': [0, 0]} for team in teams}
+    for game in games:
+        home_won = game['home_points'] > game['away_points']
+        for school, won in ((game['home_team'], home_won), (game['away_team'], not home_won)):
+            totals[school]['total'][0 if won else 1] += 1
+            if game['conference_game']:
+                totals[school]['conference'][0 if won else 1] += 1
+    return [
+        {
+            'year': SEASON, 'teamId': team['id'], 'team': team['school'], 'conference': team['conference'],
+            'division': '', 'expectedWins': None,
+            'total': {'games': sum(totals[team['school']]['total']), 'wins': totals[team['school']]['total'][0],
+                      'losses': totals[team['school']]['total'][1], 'ties': 0},
+            'conferenceGames': {'games': sum(totals[team['school']]['conference']),
+                                'wins': totals[team['school']]['conference'][0],
+                                'losses': totals[team['school']]['conference'][1], 'ties': 0},
+        }
+        for team in teams
+    ]
+
+
+def _build_rankings(rng, teams, week, season_type):
+    ranked = rng.sample(teams, 25)
+    return [{
+        'season': SEASON, 'seasonType': season_type, 'week': week,
+        'polls': [{
+            'poll': 'AP Top 25',
+            'ranks': [{'rank': rank, 'teamId': team['id'], 'school': team['school'],
+                       'conference': team['conference'], 'firstPlaceVotes': 0, 'points': 1550 - rank * 60}
+                      for rank, team in enumerate(ranked, start=1)],
+        }],
+    }]
+
+
+def _build_scoreboard(rng, games):
+    # Live Saturday snapshot: a third of the regular week in progress, the rest split final/scheduled
+    scoreboard = []
+    for index, game in enumerate(games):
+        status = ('in_progress', 'completed', 'scheduled')[index % 3]
+        live = status == 'in_progress'
+        scoreboard.append({
+            'id': game['id'], 'startDate': game['start_date'], 'startTimeTBD': False,
+            'tv': rng.choice(OUTLETS), 'neutralSite': False, 'conferenceGame': game['conference_game'],
+            'status': status, 'period': rng.randrange(1, 5) if live else (4 if status == 'completed' else None),
+            'clock': f"00:{rng.randrange(0, 15):02}:{rng.randrange(0, 60):02}" if live else None,
+            'situation': f"{rng.randrange(1, 5)}{('st', 'nd', 'rd', 'th')[rng.randrange(4)]} & {rng.randrange(1, 15)}"
+                         if live else None,
+            'possession': rng.choice(('home', 'away')) if live else None,
+            'lastPlay': None, 'venue': {'name': None, 'city': None, 'state': None},
+            'homeTeam': {'id': game['home_id'], 'name': game['home_team'], 'conference': game['home_conference'],
+                         'classification': 'fbs', 'points': game['home_points'] if status != 'scheduled' else None,
+                         'lineScores': game['home_line_scores'] if status != 'scheduled' else None},
+            'awayTeam': {'id': game['away_id'], 'name': game['away_team'], 'conference': game['away_conference'],
+                         'classification': 'fbs', 'points': game['away_points'] if status != 'scheduled' else None,
+                         'lineScores': game['away_line_scores'] if status != 'scheduled' else None},
+            'weather': None,
+            'betting': {'spread': rng.randrange(-30, 30) / 2, 'overUnder': rng.randrange(80, 140) / 2,
+                        'homeMoneyline': None, 'awayMoneyline': None},
+        })
+    return scoreboard
+
+
+def build_synthetic(directory=SYNTHETIC_DIR, seed=2024):
+    rng = random.Random(seed)
+    teams = _fbs_teams()
+    weeks = {
+        ('regular', REGULAR_WEEK): (datetime(SEASON, 11, 2, tzinfo=timezone.utc), len(teams) // 2),
+        ('postseason', BOWL_WEEK): (datetime(SEASON, 12, 21, tzinfo=timezone.utc), 45),
+    }
+    all_games = []
+    for (season_type, week), (kickoff_day, game_count) in weeks.items():
+        games, lines, media, game_stats = _build_week(rng, teams, week, season_type, kickoff_day, game_count)
+        for endpoint, data in zip(WEEKLY_ENDPOINTS, (games, lines, media, game_stats)):
+            save_fixture(directory, fixture_name(endpoint, week, season_type), data)
+        save_fixture(directory, fixture_name('rankings', week, season_type),
+                     _build_rankings(rng, teams, week, season_type))
+        all_games.extend(games)
+        if season_type == 'regular':
+            save_fixture(directory, fixture_name('scoreboard'), _build_scoreboard(rng, games))
+    save_fixture(directory, fixture_name('records'), _build_records(teams, all_games))
+    save_fixture(directory, fixture_name('calendar'), _build_calendar())
+
+
+def ensure_fixtures():
+    # Rebuilds when the synthetic set predates the newest endpoint (rankings)
+    expected = (fixture_name('calendar'), fixture_name('rankings', REGULAR_WEEK))
+    if not all(os.path.exists(os.path.join(SYNTHETIC_DIR, name)) for name in expected):
+        build_synthetic()
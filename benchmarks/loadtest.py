@@ -0,0 +1,386 @@
+# benchmarks/loadtest.py
+# End-to-end load test: runs the app under gunicorn+gevent against the stub API and drives the
+# real /_dash-update-component endpoint with simulated viewer sessions at rising concurrency.
+#   python -m benchmarks.loadtest --levels 1,10,25,50 --duration 60 --tick 5
+# Reports throughput, p50/p95/p99 per callback and RSS per gunicorn worker for each level.
+# Failures are split into overload (timeouts, refused connections, gateway errors: what the app
+# reaching its limit looks like) and errors (any other failed response: a bug to look at).
+import argparse
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+import requests
+from benchmarks.fixtures import REGULAR_WEEK
+from benchmarks.stub_api import start_stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Callback name -> a substring that identifies its output in /_dash-dependencies
+CALLBACKS = {
+    'seasons': 'season-selector.options',
+    'week_options': 'week-selector.options',
+    'games_data': 'games-data.data',
+    'static_items': 'static-game-info.children',
+    'pager': '..more-game-info.children@',
+    'scores': 'scores-data.data',
+    'dynamic_items': '"type":"home-score"',
+    'matchup': '"type":"matchup"',
+}
+# Seconds between polls of a background callback's job
+POLL_INTERVAL = 0.1
+# Statuses a saturated dyno answers with, counted as overload rather than errors
+OVERLOAD_STATUSES = (502, 503, 504)
+VIEWER_TIMEZONES = ('America/New_York', 'America/Chicago', 'America/Denver', 'America/Los_Angeles')
+# Inputs of the game list besides the week: viewers in the load test don't filter
+NO_FILTERS = [{'id': component, 'property': 'value', 'value': value}
+              for component, value in (('conference-filter', None), ('team-filter', None), ('status-filter', None),
+                                       ('outlet-filter', None), ('ranked-filter', []))]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _pattern_id(type_name, index):
+    return {'index': index, 'type': type_name}
+
+
+def _prop_id(component_id, prop):
+    if isinstance(component_id, dict):
+        component_id = json.dumps(component_id, sort_keys=True, separators=(',', ':'))
+    return f"{component_id}.{prop}"
+
+
+def _output_specs(output):
+    parts = output[2:-2].split('...') if output.startswith('..') else [output]
+    specs = []
+    for part in parts:
+        component, _, prop = part.rpartition('.')
+        specs.append((component, prop))
+    return specs
+
+
+def _find_ids(tree, type_name, found):
+    # Collects pattern-matching component ids of one type from a rendered component tree
+    if isinstance(tree, dict):
+        component_id = tree.get('props', {}).get('id') if 'props' in tree else None
+        if isinstance(component_id, dict) and component_id.get('type') == type_name:
+            found.append(component_id['index'])
+        for value in tree.values():
+            _find_ids(value, type_name, found)
+    elif isinstance(tree, list):
+        for item in tree:
+            _find_ids(item, type_name, found)
+    return found
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.overloads = defaultdict(int)
+
+    def record(self, name, seconds, outcome):
+        with self.lock:
+            self.latencies[name].append(seconds)
+            if outcome == 'error':
+                self.errors[name] += 1
+            elif outcome == 'overload':
+                self.overloads[name] += 1
+
+
+class ViewerSession:
+    # One simulated browser tab: initial load, 30s score ticks, week switches and matchup clicks
+    def __init__(self, base_url, outputs, weeks, recorder, tick, click_rate, switch_rate):
+        self.base_url = base_url
+        self.outputs = outputs
+        self.weeks = weeks
+        self.recorder = recorder
+        self.tick = tick
+        self.click_rate = click_rate
+        self.switch_rate = switch_rate
+        self.http = requests.Session()
+        self.week = None
+        self.season = None
+        # Viewers spread over US zones, as their browsers would report them
+        self.timezone = random.choice(VIEWER_TIMEZONES)
+        self.game_ids = []
+        self.clicks = {}
+        self.games_data = []
+        self.scores_data = []
+        self.n_intervals = 0
+
+    def _post(self, name, outputs, inputs, state, changed):
+        payload = {
+            'output': self.outputs[name],
+            'outputs': outputs if len(outputs) > 1 or self.outputs[name].startswith('..') else outputs[0],
+            'inputs': inputs,
+            'state': state,
+            'changedPropIds': changed,
+        }
+        start = time.perf_counter()
+        try:
+            url = f"{self.base_url}/_dash-update-component"
+            response = self.http.post(url, json=payload, timeout=120)
+            ok = response.status_code in (200, 204)
+            body = response.json() if response.status_code == 200 else {}
+            # Background callbacks answer with a job, polled as the browser does until the result
+            # (or a 204) arrives; in-progress replies carry only progress
+            if ok and 'job' in body:
+                params = {'cacheKey': body['cacheKey'], 'job': body['job']}
+                while response.status_code == 200 and 'response' not in body:
+                    time.sleep(POLL_INTERVAL)
+                    response = self.http.post(url, params=params, json=payload, timeout=120)
+                    ok = response.status_code in (200, 204)
+                    body = response.json() if response.status_code == 200 else {}
+            outcome = 'ok' if ok else 'overload' if response.status_code in OVERLOAD_STATUSES else 'error'
+        except (requests.Timeout, requests.ConnectionError):
+            outcome, body = 'overload', {}
+        except requests.RequestException:
+            outcome, body = 'error', {}
+        self.recorder.record(name, time.perf_counter() - start, outcome)
+        return body.get('response', {})
+
+    def _outputs(self, name, index=None, indices=None):
+        specs = []
+        for component, prop in _output_specs(self.outputs[name]):
+            if component.startswith('{'):
+                type_name = json.loads(component)['type']
+                if indices is not None:
+                    specs.append([{'id': _pattern_id(type_name, i), 'property': prop} for i in indices])
+                else:
+                    specs.append({'id': _pattern_id(type_name, index), 'property': prop})
+            else:
+                specs.append({'id': component, 'property': prop})
+        return specs
+
+    def load(self):
+        start = time.perf_counter()
+        for path in ('/', '/_dash-layout', '/_dash-dependencies'):
+            self.http.get(f"{self.base_url}{path}", timeout=120)
+        self.recorder.record('page_load', time.perf_counter() - start, 'ok')
+        seasons = self._post('seasons', self._outputs('seasons'),
+                             [{'id': 'week-options-store', 'property': 'data', 'value': False}], [], [])
+        self.season = seasons.get('season-selector', {}).get('options', [{}])[0].get('value')
+        response = self._post('week_options', self._outputs('week_options'),
+                              [{'id': 'week-options-store', 'property': 'data', 'value': False},
+                               {'id': 'season-selector', 'property': 'value', 'value': self.season}], [], [])
+        self.week = response.get('week-selector', {}).get('value', REGULAR_WEEK)
+        if self.week not in self.weeks:
+            self.week = self.weeks[0]  # Default week has no fixtures; land on one that does
+        games = self._post('games_data', self._outputs('games_data'),
+                           [{'id': 'selected-week', 'property': 'data', 'value': None},
+                            {'id': 'season-selector', 'property': 'value', 'value': self.season}], [], [])
+        self.games_data = games.get('games-data', {}).get('data', [])
+        self.switch_week(self.week)
+
+    def switch_week(self, week):
+        self.week = week
+        response = self._post('static_items', self._outputs('static_items'),
+                              [{'id': 'week-selector', 'property': 'value', 'value': week}] + NO_FILTERS,
+                              [{'id': 'viewer-timezone', 'property': 'data', 'value': self.timezone},
+                               {'id': 'season-selector', 'property': 'value', 'value': self.season}],
+                              ['week-selector.value'])
+        self.game_ids = _find_ids(response.get('static-game-info', {}).get('children', []), 'game-button', [])
+        game_order = response.get('game-order', {}).get('data', {})
+        pager_ticks = 0
+        # The pager interval keeps appending pages until the week's remaining ids are drained
+        while game_order and game_order.get('ids'):
+            pager_ticks += 1
+            response = self._post('pager', self._outputs('pager'),
+                                  [{'id': 'game-pager', 'property': 'n_intervals', 'value': pager_ticks}],
+                                  [{'id': 'game-order', 'property': 'data', 'value': game_order},
+                                   {'id': 'week-selector', 'property': 'value', 'value': week},
+                                   {'id': 'viewer-timezone', 'property': 'data', 'value': self.timezone},
+                                   {'id': 'season-selector', 'property': 'value', 'value': self.season}],
+                                  ['game-pager.n_intervals'])
+            if not response:
+                break
+            self.game_ids += _find_ids(response.get('more-game-info', {}), 'game-button', [])
+            game_order = response.get('game-order', {}).get('data', {})
+        self.clicks = {game_id: 0 for game_id in self.game_ids}
+        self.scores_data = []
+        self.matchup(None)
+
+    def score_tick(self):
+        self.n_intervals += 1
+        response = self._post('scores', self._outputs('scores'),
+                              [{'id': 'interval-scores', 'property': 'n_intervals', 'value': self.n_intervals},
+                               {'id': 'init-complete', 'property': 'data', 'value': True}],
+                              [{'id': 'scores-data', 'property': 'data', 'value': self.scores_data}],
+                              ['interval-scores.n_intervals'])
+        scores = response.get('scores-data', {}).get('data')
+        if scores is None:
+            return
+        self.scores_data = scores
+        # The browser fires the MATCH callback once per rendered game when scores-data changes
+        for game_id in self.game_ids:
+            self._post('dynamic_items', self._outputs('dynamic_items', index=game_id),
+                       [{'id': 'scores-data', 'property': 'data', 'value': self.scores_data}],
+                       [{'id': _pattern_id('game-button', game_id), 'property': 'value', 'value': game_id}],
+                       ['scores-data.data'])
+
+    def matchup(self, game_id):
+        changed = ['week-selector.value']
+        if game_id is not None:
+            self.clicks[game_id] += 1
+            changed = [_prop_id(_pattern_id('game-button', game_id), 'n_clicks')]
+        self._post('matchup', self._outputs('matchup', indices=self.game_ids),
+                   [[{'id': _pattern_id('game-button', i), 'property': 'n_clicks', 'value': self.clicks[i]}
+                     for i in self.game_ids],
+                    {'id': 'week-selector', 'property': 'value', 'value': self.week}],
+                   [{'id': 'games-data', 'property': 'data', 'value': self.games_data},
+                    [{'id': _pattern_id('game-button', i), 'property': 'id', 'value': _pattern_id('game-button', i)}
+                     for i in self.game_ids],
+                    {'id': 'season-selector', 'property': 'value', 'value': self.season}],
+                   changed)
+
+    def run(self, stop):
+        self.load()
+        next_tick = time.monotonic() + self.tick
+        while not stop.is_set():
+            if time.monotonic() >= next_tick:
+                self.score_tick()
+                next_tick += self.tick
+            roll = random.random()
+            if roll < self.switch_rate:
+                self.switch_week(random.choice(self.weeks))
+            elif roll < self.switch_rate + self.click_rate and self.game_ids:
+                self.matchup(random.choice(self.game_ids))
+            stop.wait(random.uniform(0.5, 1.5) * self.tick / 3)
+
+
+def worker_rss(master_pid):
+    # RSS in MiB of every gunicorn worker (children of the master process)
+    rss = {}
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/status") as file:
+                status = dict(line.split(':', 1) for line in file if ':' in line)
+        except OSError:
+            continue
+        if int(status.get('PPid', 0)) == master_pid:
+            rss[int(pid)] = int(status.get('VmRSS', '0 kB').split()[0]) / 1024
+    return rss
+
+
+def start_app(base_url, workers, port):
+    run_dir = tempfile.mkdtemp(prefix='cfb-load-')
+    env = {**os.environ, 'API_BASE_URL': base_url, 'ARCHIVE_PATH': os.path.join(run_dir, 'archive.sqlite3'),
+           'SHARED_DIR': os.path.join(run_dir, 'shared'), 'WARM_SNAPSHOT_PATH': '',
+           'STATIC_WEEKS_DIR': os.path.join(run_dir, 'static-weeks')}
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:server', '--worker-class', 'gevent', '--timeout', '120',
+         '--workers', str(workers), '--bind', f"127.0.0.1:{port}"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    app_url = f"http://127.0.0.1:{port}"
+    for _ in range(120):
+        try:
+            requests.get(f"{app_url}/_dash-dependencies", timeout=1)
+            return process, app_url
+        except requests.RequestException:
+            time.sleep(0.5)
+    process.kill()
+    raise RuntimeError("App did not start")
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def run_level(app_url, outputs, weeks, users, duration, args, master_pid):
+    recorder = Recorder()
+    stop = threading.Event()
+    sessions = [ViewerSession(app_url, outputs, weeks, recorder, args.tick, args.click_rate, args.switch_rate)
+                for _ in range(users)]
+    threads = [threading.Thread(target=session.run, args=(stop,), daemon=True) for session in sessions]
+    rss_samples = defaultdict(list)
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+        time.sleep(args.ramp / max(users, 1))
+    while time.perf_counter() - start < duration:
+        for pid, rss in worker_rss(master_pid).items():
+            rss_samples[pid].append(rss)
+        time.sleep(1)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=150)
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in recorder.latencies.values())
+    print(f"\n== {users} concurrent viewers: {total / elapsed:.1f} req/s over {elapsed:.0f}s")
+    print(f"{'callback':16} {'count':>7} {'overload':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    summary = {'users': users, 'throughput_rps': total / elapsed, 'callbacks': {}, 'worker_rss_mib': {}}
+    for name, values in sorted(recorder.latencies.items()):
+        values.sort()
+        stats = {'count': len(values), 'overloads': recorder.overloads[name], 'errors': recorder.errors[name],
+                 'p50_ms': percentile(values, 0.50), 'p95_ms': percentile(values, 0.95),
+                 'p99_ms': percentile(values, 0.99)}
+        summary['callbacks'][name] = stats
+        print(f"{name:16} {stats['count']:>7} {stats['overloads']:>8} {stats['errors']:>7} {stats['p50_ms']:>9.1f} "
+              f"{stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+    for pid, samples in sorted(rss_samples.items()):
+        summary['worker_rss_mib'][pid] = {'mean': statistics.mean(samples), 'max': max(samples)}
+        print(f"worker {pid}: RSS mean {statistics.mean(samples):.1f} MiB, max {max(samples):.1f} MiB")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Saturday traffic against one app dyno")
+    parser.add_argument('--levels', default='1,5,10,25,50', help="Comma-separated concurrent viewer counts")
+    parser.add_argument('--duration', type=float, default=60, help="Seconds per concurrency level")
+    parser.add_argument('--workers', type=int, default=1, help="Gunicorn workers")
+    parser.add_argument('--tick', type=float, default=30, help="Score poll interval in seconds (app uses 30)")
+    parser.add_argument('--click-rate', type=float, default=0.15, help="Chance per action of a matchup click")
+    parser.add_argument('--switch-rate', type=float, default=0.05, help="Chance per action of a week switch")
+    parser.add_argument('--ramp', type=float, default=5, help="Seconds to stagger session starts over")
+    parser.add_argument('--latency', type=float, default=80, help="Stub upstream latency in milliseconds")
+    parser.add_argument('--app-url', help="Drive an already running app instead of starting gunicorn")
+    parser.add_argument('--output', help="Write the JSON summary to this file")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub(latency=args.latency / 1000, jitter=args.latency / 2000)
+    process = None
+    if args.app_url:
+        app_url, master_pid = args.app_url.rstrip('/'), -1
+    else:
+        process, app_url = start_app(stub_url, args.workers, _free_port())
+        master_pid = process.pid
+    try:
+        dependencies = requests.get(f"{app_url}/_dash-dependencies", timeout=30).json()
+        outputs = {name: next(dep['output'] for dep in dependencies if marker in dep['output'])
+                   for name, marker in CALLBACKS.items()}
+        # Only switch between weeks the stub has fixtures for
+        weeks = [week['week'] for week in requests.get(f"{stub_url}/calendar", timeout=30).json()
+                 if week.get('seasonType', 'regular') == 'regular'
+                 and requests.get(f"{stub_url}/games", params={'week': week['week']}, timeout=30).json()]
+        weeks = weeks or [REGULAR_WEEK]
+        results = [run_level(app_url, outputs, weeks, int(users), args.duration, args, master_pid)
+                   for users in args.levels.split(',')]
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump(results, file, indent=2)
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=30)
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
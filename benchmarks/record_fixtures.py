@@ -0,0 +1,53 @@
+# benchmarks/record_fixtures.py
+# Records live collegefootballdata.com responses into benchmarks/fixtures/recorded.
+# Needs API_KEY. Record the scoreboard during a live Saturday to capture in-progress games.
+import argparse
+from config import (GAMES_URL, ODDS_URL, MEDIA_URL, GAME_STATS_URL, RECORDS_URL,
+                    SCHEDULE_URL, SCOREBOARD_URL, RANKINGS_URL)
+from api import fetch_data_from_api
+from benchmarks.fixtures import (RECORDED_DIR, REGULAR_WEEK, BOWL_WEEK, SEASON,
+                                 fixture_name, save_fixture)
+
+WEEKLY_URLS = {
+    'games': (GAMES_URL, {'division': 'fbs'}),
+    'lines': (ODDS_URL, {}),
+    'media': (MEDIA_URL, {}),
+    'game_stats': (GAME_STATS_URL, {'classification': 'fbs'}),
+    'rankings': (RANKINGS_URL, {}),
+}
+
+
+def record_week(season, week, season_type):
+    for endpoint, (url, extra) in WEEKLY_URLS.items():
+        data = fetch_data_from_api(url, {'year': season, 'week': week, 'seasonType': season_type, **extra})
+        if data is not None:
+            save_fixture(RECORDED_DIR, fixture_name(endpoint, week, season_type), data)
+            print(f"Recorded {season_type} week {week} {endpoint}: {len(data)} items")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record upstream responses for the benchmark stub")
+    parser.add_argument('--season', type=int, default=SEASON)
+    parser.add_argument('--week', type=int, action='append', help="Regular-season week(s) to record")
+    parser.add_argument('--bowl-week', type=int, default=BOWL_WEEK, help="Postseason week to record")
+    parser.add_argument('--scoreboard-only', action='store_true', help="Only capture the live scoreboard")
+    args = parser.parse_args()
+
+    if not args.scoreboard_only:
+        for week in args.week or [REGULAR_WEEK]:
+            record_week(args.season, week, 'regular')
+        record_week(args.season, args.bowl_week, 'postseason')
+        for endpoint, url in (('records', RECORDS_URL), ('calendar', SCHEDULE_URL)):
+            data = fetch_data_from_api(url, {'year': args.season})
+            if data is not None:
+                save_fixture(RECORDED_DIR, fixture_name(endpoint), data)
+                print(f"Recorded {endpoint}: {len(data)} items")
+
+    data = fetch_data_from_api(SCOREBOARD_URL, {'classification': 'fbs'})
+    if data is not None:
+        save_fixture(RECORDED_DIR, fixture_name('scoreboard'), data)
+        print(f"Recorded scoreboard: {len(data)} games")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/stub_api.py
+# Local stand-in for api.collegefootballdata.com that replays fixtures with configurable latency.
+# Point the app at it with API_BASE_URL=http://127.0.0.1:<port>.
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from benchmarks.fixtures import ensure_fixtures, fixture_name, load_fixture
+
+# Request path -> (fixture endpoint, keyed by week)
+ROUTES = {
+    '/games': ('games', True),
+    '/lines': ('lines', True),
+    '/games/media': ('media', True),
+    '/games/teams': ('game_stats', True),
+    '/rankings': ('rankings', True),
+    '/records': ('records', False),
+    '/calendar': ('calendar', False),
+    '/scoreboard': ('scoreboard', False),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+    jitter = 0.0
+    # The app does not send seasonType, so a stub can be started to answer postseason weeks
+    season_type = 'regular'
+    _cache = {}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path)
+        if route is None:
+            self.send_error(404)
+            return
+        endpoint, weekly = route
+        params = parse_qs(url.query)
+        if weekly:
+            week = params.get('week', [None])[0]
+            season_type = params.get('seasonType', [self.season_type])[0]
+            name = fixture_name(endpoint, week, season_type) if week else None
+        else:
+            name = fixture_name(endpoint)
+        body = self._body(name)
+
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self, name):
+        if name not in self._cache:
+            data = load_fixture(name) if name else None
+            self._cache[name] = json.dumps(data if data is not None else []).encode()
+        return self._cache[name]
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(port=0, latency=0.0, jitter=0.0, season_type='regular'):
+    # Starts the stub on a background thread and returns (server, base_url)
+    ensure_fixtures()
+    handler = type('ConfiguredStubHandler', (StubHandler,),
+                   {'latency': latency, 'jitter': jitter, 'season_type': season_type, '_cache': {}})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded CFBD responses locally")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Fixed delay per response in milliseconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random delay up to this many milliseconds")
+    parser.add_argument('--season-type', default='regular', choices=('regular', 'postseason'),
+                        help="Season type answered when the request does not specify one")
+    args = parser.parse_args()
+    server, base_url = start_stub(args.port, args.latency / 1000, args.jitter / 1000, args.season_type)
+    print(f"Stub API serving on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
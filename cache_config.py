@@ -1,11 +1,19 @@
 #cache_config.py
 from flask_caching import Cache
+from flask_caching.backends import FileSystemCache
 import diskcache
+from serialization import ENABLED as FAST_JSON_ENABLED, FastCacheSerializer
+
+
+class FastFileSystemCache(FileSystemCache):
+    serializer = FastCacheSerializer()
+
 
 # Initialize diskcache explicitly for Heroku's ephemeral storage
 disk_cache = diskcache.Cache("cache-directory")  # Set directory for disk storage
 cache = Cache(config={
-    'CACHE_TYPE': 'FileSystemCache',  # Use file system cache, which works with DiskCache as well
+    # Use file system cache, which works with DiskCache as well; FAST_JSON stores values with orjson
+    'CACHE_TYPE': 'cache_config.FastFileSystemCache' if FAST_JSON_ENABLED else 'FileSystemCache',
     'CACHE_DIR': "cache-directory",  # Directory for disk-based caching
     'CACHE_DEFAULT_TIMEOUT': 1800,  # Cache timeout set to 30 minutes
 })
\ No newline at end of file
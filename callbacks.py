@@ -1,52 +1,153 @@
 import json
 import dash
-from dash import html, Input, Output, MATCH, State, callback_context
+from dash import html, Input, Output, MATCH, State, Patch, callback_context
 import dash_bootstrap_components as dbc
-from datetime import datetime, date
-from utils import (create_scoreboard, get_schedule, get_games, clean_games, get_media,
-                   create_records, get_records, create_home_away_teams, get_lines, get_team_stats,
-                   create_comparison_row, format_time, color_similarity, display_matchup, display_results,
-                   display_boxscore)
+from datetime import date
+from utils import (create_scoreboard, get_week_options, get_week_games, get_team_stats,
+                   create_comparison_row, format_time, display_matchup, display_results,
+                   display_boxscore, get_live_game_ids, get_ranked_teams)
+from config import YEAR, GAMES_FIRST_PAGE, GAMES_PAGE
+from filters import build_game_index, matching_ids, outlet_options
+from logos import logo_src
+from timezones import format_kickoff
+from metrics import set_live_games
+import store
+from profiling import profiled
+from jobs import report, checkpoint
 
 
 initial_api_call_returned_events = True
 
+
+# Builds the button, matchup container and divider for one game in the week list
+def create_game_row(game, zone_name=None):
+    game_id = game.id
+    day_of_week, start_date = format_kickoff(game.start_timestamp, zone_name)
+    home_color = game.home_team_color
+    away_color = game.away_team_color
+    game_completed = game.completed
+    game_status = 'Scheduled'
+    home_team_extra_info = ""
+    away_team_extra_info = ""
+
+    if game_completed:
+        home_score = game.home_points
+        away_score = game.away_points
+        quarter_time_display = "Final"
+        game_status = "Completed"
+    else:
+        home_score = ""
+        away_score = ""
+        quarter_time_display = ""
+
+    return [
+        dbc.Button(
+            dbc.Row([
+                dbc.Col(html.Img(src=logo_src(game.away_id, 100), height="100px"), width=1,
+                        style={'textAlign': 'center'}),
+                dbc.Col(
+                    html.Div([
+                        html.H4(game.away_team, style={'color': away_color, 'fontWeight': 'bold'}),
+                        html.P(f"{game.away_total_wins} - {game.away_total_losses}", style={'color': away_color, 'fontWeight': 'bold', 'margin': '0', 'padding': '0'}),
+                        html.H3(away_score, id={'type': 'away-score', 'index': game_id},
+                                style={'color': away_color, 'fontWeight': 'bold'}),
+                        html.H6(away_team_extra_info, id={'type': 'away-extra', 'index': game_id},
+                                style={'color': away_color}),
+                    ], style={'textAlign': 'center'}),
+                    width=3,
+                ),
+                dbc.Col(
+                    html.Div([
+                        html.H6(game_status, id={'type': 'game-status', 'index': game_id},
+                                style={'fontWeight': 'bold'}),
+                        html.H5(quarter_time_display, id={'type': 'quarter-time', 'index': game_id},
+                                style={'fontWeight': 'bold'}),
+                        html.H6(f"{game.spread} • O/U {game.over_under}") if game.spread else "",
+                        html.P(f"{day_of_week}, {start_date}", style={'margin': '0', 'padding': '0'}),
+                        html.P(f"{game.outlet}",
+                               style={'margin': '0', 'padding': '0'}),
+                    ], style={'textAlign': 'center'}),
+                    width=4
+                ),
+                dbc.Col(
+                    html.Div([
+                        html.H4(game.home_team, style={'color': home_color, 'fontWeight': 'bold'}),
+                        html.P(f"{game.home_total_wins} - {game.home_total_losses}", style={'color': home_color, 'fontWeight': 'bold', 'margin': '0', 'padding': '0'}),
+                        html.H3(home_score, id={'type': 'home-score', 'index': game_id},
+                                style={'color': home_color, 'fontWeight': 'bold'}),
+                        html.H6(home_team_extra_info, id={'type': 'home-extra', 'index': game_id},
+                                style={'color': home_color}),
+                    ], style={'textAlign': 'center'}),
+                    width=3
+                ),
+                dbc.Col(html.Img(src=logo_src(game.home_id, 100), height="100px"), width=1,
+                        style={'textAlign': 'center'}),
+
+            ], className="game-row", style={'padding': '10px'}),
+            id={'type': 'game-button', 'index': game_id},
+            n_clicks=0,
+            color='medium',
+            className='dash-bootstrap',
+            style={
+                '--team-home-color': home_color,
+                '--team-away-color': away_color,
+                'width': '100%',
+                'textAlign': 'left'
+            },
+            value=game_id,
+        ),
+        html.Div(id={'type': 'matchup', 'index': game_id}, children=[]),
+        html.Hr(),
+    ]
+
+
+# Live games first, then games still to be played, then finals; ties keep API order
+def order_games(games, live_ids):
+    live_ids = set(live_ids)
+    return sorted(games, key=lambda game: (
+        game.id not in live_ids,
+        game.completed == True,
+    ))
+
+
 def register_callbacks(app):
 
+    # The browser reports its IANA zone so kickoff times render in the viewer's local time
+    app.clientside_callback(
+        "function(_) { return Intl.DateTimeFormat().resolvedOptions().timeZone; }",
+        Output('viewer-timezone', 'data'),
+        Input('week-options-store', 'data'),
+    )
+
+
+    @app.callback(
+        Output('season-selector', 'options'),
+        [Input('week-options-store', 'data')],
+    )
+    def update_season_options(week_options_fetched):
+        # Current season plus every season with archived weeks
+        seasons = sorted({int(YEAR), *store.seasons()}, reverse=True)
+        return [{'label': str(season), 'value': str(season)} for season in seasons]
+
+
     @app.callback(
         Output('week-selector', 'options'),
         Output('week-selector', 'value'),
-        [Input('week-options-store', 'data')],
+        [Input('week-options-store', 'data'),
+         Input('season-selector', 'value')],
     )
-    def update_week_options(week_options_fetched):
-        # Fetch schedule data for weeks
-        weeks_data = get_schedule()  # This function should return a list of dictionaries containing week data
-
-        # Process each week's information to create dropdown options
-        week_options = []
-        for week in weeks_data:
-            # Parse ISO 8601 format (e.g., '2024-08-24T04:00:00.000Z')
-            first_game_start = datetime.fromisoformat(week['firstGameStart'].replace('Z', '')).date() \
-                if isinstance(week['firstGameStart'], str) else week['firstGameStart']
-            last_game_start = datetime.fromisoformat(week['lastGameStart'].replace('Z', '')).date() \
-                if isinstance(week['lastGameStart'], str) else week['lastGameStart']
-
-            week_label = f"Week {week['week']} ({first_game_start.strftime('%b-%d')} - {last_game_start.strftime('%b-%d')})"
-            week_options.append({'label': week_label, 'value': week['week'], 'lastGameStart': last_game_start})
+    def update_week_options(week_options_fetched, season):
+        week_options = get_week_options(season or YEAR)
 
         # Set default week selection based on the current date or the first available week
-        current_date = date.today()
-        selected_value = None
-        for week in week_options:
-            if current_date <= week['lastGameStart']:
-                selected_value = week['value']
-                break
+        current_date = date.today().isoformat()
+        selected_value = next((week['value'] for week in week_options if current_date <= week['lastGameDate']), None)
 
         # Default to the first week if no match is found
         if selected_value is None and week_options:
             selected_value = week_options[0]['value']
 
-        # Drop 'lastGameStart' from week_options for display
+        # Drop 'lastGameDate' from week_options for display
         week_options = [{'label': option['label'], 'value': option['value']} for option in week_options]
 
         return week_options, selected_value
@@ -54,176 +155,97 @@ def register_callbacks(app):
 
     @app.callback(
         Output('games-data', 'data'),
-        Input('selected-week', 'data'),
+        [Input('selected-week', 'data'),
+         Input('season-selector', 'value')],
     )
-    def create_display(week):
-        # Fetch and process the scoreboard data
-        games = get_games(week)
-        schedule = clean_games(games)  # Clean and format game data
-        games_with_teams = create_home_away_teams(schedule)  # Add team logos
-        media_data = get_media(week)  # Add media outlet information
-        betting_lines = get_lines(week)  # Add betting info
-
-        # Join betting lines to games by 'id'
-        games_with_betting = []
-        for game in games_with_teams:
-            betting_info = next((bet for bet in betting_lines if bet['id'] == game['id']), None)
-            game_with_betting = {**game}
-            if betting_info:
-                game_with_betting.update({
-                    'spread': betting_info['spread'],
-                    'over_under': betting_info['over_under']
-                })
-            else:
-                game_with_betting.update({
-                    'spread': 'N/A',
-                    'over_under': 'N/A',
-                    'home_moneyline': 'N/A',
-                    'away_moneyline': 'N/A'
-                })
-            games_with_betting.append(game_with_betting)
-
-        # Join media outlets to games by 'id'
-        games_with_media = []
-        for game in games_with_betting:
-            media_info = next((media for media in media_data if media['id'] == game['id']), None)
-            game_with_media = {**game}
-            if media_info:
-                game_with_media['outlet'] = media_info['outlet']
-            else:
-                game_with_media['outlet'] = "N/A"
-            games_with_media.append(game_with_media)
-
-        # Add team records
-        team_records = create_records(get_records())
-        team_records_by_name = {record['team']: record for record in team_records}
-
-        games_with_records = []
-        for game in games_with_media:
-            home_team_record = team_records_by_name.get(game['home_team'], {
-                'Total Wins': 'N/A',
-                'Total Losses': 'N/A',
-                'Conference Wins': 'N/A',
-                'Conference Losses': 'N/A'
-            })
-            away_team_record = team_records_by_name.get(game['away_team'], {
-                'Total Wins': 'N/A',
-                'Total Losses': 'N/A',
-                'Conference Wins': 'N/A',
-                'Conference Losses': 'N/A'
-            })
-
-            game_with_records = {**game}
-            game_with_records.update({
-                'home_total_wins': home_team_record.get('Total Wins'),
-                'home_total_losses': home_team_record.get('Total Losses'),
-                'home_conference_wins': home_team_record.get('Conference Wins'),
-                'home_conference_losses': home_team_record.get('Conference Losses'),
-                'away_total_wins': away_team_record.get('Total Wins'),
-                'away_total_losses': away_team_record.get('Total Losses'),
-                'away_conference_wins': away_team_record.get('Conference Wins'),
-                'away_conference_losses': away_team_record.get('Conference Losses')
-            })
-
-            games_with_records.append(game_with_records)
-
-        return games_with_records
-
-
-    # Main scoreboard display function
+    @profiled('create_display')
+    def create_display(week, season=YEAR):
+        return [game.to_dict() for game in get_week_games(week, season)]
+
+
+    # Index over the week's enriched games used by the filters
+    def game_index(week, season, ranked=False):
+        # Rankings are only fetched when the ranked filter needs them
+        return build_game_index(get_week_games(week, season), get_ranked_teams(week, season) if ranked else [])
+
+
+    @app.callback(
+        Output('outlet-filter', 'options'),
+        [Input('week-selector', 'value')],
+        [State('season-selector', 'value')]
+    )
+    def update_outlet_options(selected_week, season=YEAR):
+        return outlet_options(game_index(selected_week, season))
+
+
+    # Main scoreboard display function. Renders the first page of games matching the filters right
+    # away and hands the remaining ids to the pager, which appends them in pages so first paint
+    # doesn't grow with the week
     @app.callback(
-        [Output('static-game-info', 'children'), Output('init-complete', 'data')],
-        [Input('week-selector', 'value')]
+        [Output('static-game-info', 'children'), Output('init-complete', 'data'),
+         Output('game-order', 'data'), Output('more-game-info', 'children'),
+         Output('game-pager', 'disabled'), Output('game-pager', 'n_intervals')],
+        [Input('week-selector', 'value'),
+         Input('conference-filter', 'value'),
+         Input('team-filter', 'value'),
+         Input('status-filter', 'value'),
+         Input('outlet-filter', 'value'),
+         Input('ranked-filter', 'value')],
+        # A State: the browser reports its zone before the week is first selected, and an Input
+        # would render the list a second time when it arrives
+        [State('viewer-timezone', 'data'),
+         State('season-selector', 'value')],
+        background=True,
+        interval=200,
+        progress=[Output('week-progress', 'value'), Output('week-progress', 'label')],
+        running=[(Output('week-progress', 'style'), {'display': 'flex'}, {'display': 'none'})]
     )
-    def display_static_items(selected_week):
+    @profiled('display_static_items')
+    def display_static_items(selected_week, conferences=None, teams=None, statuses=None, outlets=None,
+                             ranked=None, zone_name=None, season=YEAR):
         # print("Displaying static items")
-        current_games = create_display(selected_week)
-        # Convert DataFrame to list of dictionaries
-        sorted_games = sorted(current_games, key=lambda x: (
-            x['completed'] == True,
-            x['completed'] == False,
-        ))
-        games_info = []
-        for game in sorted_games:
-            game_id = game['id']
-            home_color = game['home_team_color']
-            away_color = game['away_team_color']
-            game_completed = game['completed']
-            game_status = 'Scheduled'
-            home_team_extra_info = ""
-            away_team_extra_info = ""
-
-            if game_completed:
-                home_score = game['home_points']
-                away_score = game['away_points']
-                quarter_time_display = "Final"
-                game_status = "Completed"
-            else:
-                home_score = ""
-                away_score = ""
-                quarter_time_display = ""
-
-            games_info.append(
-                dbc.Button(
-                    dbc.Row([
-                        dbc.Col(html.Img(src=game['away_team_logo'], height="100px"), width=1,
-                                style={'textAlign': 'center'}),
-                        dbc.Col(
-                            html.Div([
-                                html.H4(game['away_team'], style={'color': away_color, 'fontWeight': 'bold'}),
-                                html.P(f"{game['away_total_wins']} - {game['away_total_losses']}", style={'color': away_color, 'fontWeight': 'bold', 'margin': '0', 'padding': '0'}),
-                                html.H3(away_score, id={'type': 'away-score', 'index': game_id},
-                                        style={'color': away_color, 'fontWeight': 'bold'}),
-                                html.H6(away_team_extra_info, id={'type': 'away-extra', 'index': game_id},
-                                        style={'color': away_color}),
-                            ], style={'textAlign': 'center'}),
-                            width=3,
-                        ),
-                        dbc.Col(
-                            html.Div([
-                                html.H6(game_status, id={'type': 'game-status', 'index': game_id},
-                                        style={'fontWeight': 'bold'}),
-                                html.H5(quarter_time_display, id={'type': 'quarter-time', 'index': game_id},
-                                        style={'fontWeight': 'bold'}),
-                                html.H6(f"{game['spread']} • O/U {game['over_under']}") if game['spread'] else "",
-                                html.P(f"{game['day_of_week']}, {game['start_date']}", style={'margin': '0', 'padding': '0'}),
-                                html.P(f"{game['outlet']}",
-                                       style={'margin': '0', 'padding': '0'}),
-                            ], style={'textAlign': 'center'}),
-                            width=4
-                        ),
-                        dbc.Col(
-                            html.Div([
-                                html.H4(game['home_team'], style={'color': home_color, 'fontWeight': 'bold'}),
-                                html.P(f"{game['home_total_wins']} - {game['home_total_losses']}", style={'color': home_color, 'fontWeight': 'bold', 'margin': '0', 'padding': '0'}),
-                                html.H3(home_score, id={'type': 'home-score', 'index': game_id},
-                                        style={'color': home_color, 'fontWeight': 'bold'}),
-                                html.H6(home_team_extra_info, id={'type': 'home-extra', 'index': game_id},
-                                        style={'color': home_color}),
-                            ], style={'textAlign': 'center'}),
-                            width=3
-                        ),
-                        dbc.Col(html.Img(src=game['home_team_logo'], height="100px"), width=1,
-                                style={'textAlign': 'center'}),
-
-                    ], className="game-row", style={'padding': '10px'}),
-                    id={'type': 'game-button', 'index': game_id},
-                    n_clicks=0,
-                    color='medium',
-                    className='dash-bootstrap',
-                    style={
-                        '--team-home-color': home_color,
-                        '--team-away-color': away_color,
-                        'width': '100%',
-                        'textAlign': 'left'
-                    },
-                    value=game_id,
-                )
-            )
-            games_info.append(html.Div(id={'type': 'matchup', 'index': game_id}, children=[]))
-            games_info.append(html.Hr())
-
-        return games_info, True
+        report(10, "Loading games")
+        current_games = get_week_games(selected_week, season)
+        report(60, "Filtering")
+        live_ids = get_live_game_ids() if str(season) == str(YEAR) else []
+        if conferences or teams or statuses or outlets or ranked:
+            selected_ids = matching_ids(game_index(selected_week, season, bool(ranked)), live_ids, conferences, teams,
+                                        statuses, outlets, bool(ranked))
+            current_games = [game for game in current_games if game.id in selected_ids]
+            if not current_games:
+                no_games = html.P("No games match the selected filters.", style={'textAlign': 'center'})
+                return no_games, True, {}, [], True, 0
+        report(80, "Rendering")
+        sorted_games = order_games(current_games, live_ids)
+        first_page, rest = sorted_games[:GAMES_FIRST_PAGE], sorted_games[GAMES_FIRST_PAGE:]
+        games_info = [item for game in first_page for item in create_game_row(game, zone_name)]
+        game_order = {'week': selected_week, 'season': season, 'ids': [game.id for game in rest]}
+        return games_info, True, game_order, [], not rest, 0
+
+
+    @app.callback(
+        [Output('more-game-info', 'children', allow_duplicate=True),
+         Output('game-order', 'data', allow_duplicate=True),
+         Output('game-pager', 'disabled', allow_duplicate=True)],
+        [Input('game-pager', 'n_intervals')],
+        [State('game-order', 'data'),
+         State('week-selector', 'value'),
+         State('viewer-timezone', 'data'),
+         State('season-selector', 'value')],
+        prevent_initial_call=True
+    )
+    @profiled('load_more_games')
+    def load_more_games(n_intervals, game_order, selected_week, zone_name=None, season=YEAR):
+        # Ignore ticks that belong to a week (or season) the user already switched away from
+        if (not game_order or not game_order['ids'] or game_order['week'] != selected_week
+                or str(game_order['season']) != str(season)):
+            return dash.no_update, dash.no_update, True
+        page_ids, remaining = game_order['ids'][:GAMES_PAGE], game_order['ids'][GAMES_PAGE:]
+        games_by_id = {game.id: game for game in get_week_games(game_order['week'], game_order['season'])}
+        rows = Patch()
+        rows.extend([item for game_id in page_ids if game_id in games_by_id
+                     for item in create_game_row(games_by_id[game_id], zone_name)])
+        return rows, {**game_order, 'ids': remaining}, not remaining
 
 
     @app.callback(
@@ -268,6 +290,7 @@ def register_callbacks(app):
         [State('scores-data', 'data')],
         prevent_initial_call=True
     )
+    @profiled('update_game_data')
     def update_game_data(n_intervals, init_complete, prev_scores_data):
         global initial_api_call_returned_events
 
@@ -287,13 +310,13 @@ def register_callbacks(app):
 
             for game in games_data:
                 # Check if the game is in progress
-                game_status = game.get('status', '')
-                if game_status == "in_progress":
+                if game.status == "in_progress":
                     games_in_progress = True
-                    game['status'] = 'In Progress'
-                    updated_game_data.append(game)
+                    game.status = 'In Progress'
+                    updated_game_data.append(game.to_dict())
 
                 # Append the entire game dictionary with all fields
+            set_live_games(len(updated_game_data))
 
             # Check if the data has changed
             if prev_scores_data == updated_game_data:
@@ -312,15 +335,21 @@ def register_callbacks(app):
         [Input({'type': 'game-button', 'index': dash.dependencies.ALL}, 'n_clicks'),
          Input('week-selector', 'value')],
         [State('games-data', 'data'),
-         State({'type': 'game-button', 'index': dash.dependencies.ALL}, 'id')],
+         State({'type': 'game-button', 'index': dash.dependencies.ALL}, 'id'),
+         State('season-selector', 'value')],
+        background=True,
+        interval=250
     )
-    def display_recap_or_matchup(n_clicks_list, week, games_data, button_ids):
+    @profiled('display_recap_or_matchup')
+    def display_recap_or_matchup(n_clicks_list, week, games_data, button_ids, season=YEAR):
         outputs = [[] for _ in n_clicks_list]
         ctx = callback_context
         if not ctx.triggered:
             return outputs
 
         triggered_button = ctx.triggered[0]['prop_id'].split('.')[0]
+        if not triggered_button.startswith('{'):
+            return outputs  # A week switch closes every game
         game_id = json.loads(triggered_button)['index']
         triggered_button_index = next(i for i, btn_id in enumerate(button_ids) if btn_id['index'] == game_id)
 
@@ -329,11 +358,12 @@ def register_callbacks(app):
             if not game_info:
                 return outputs
             if game_info['completed']:
-                boxscore = display_boxscore(game_id, game_info)
-                results = display_results(week, game_info)
+                boxscore = display_boxscore(game_id, game_info, week, season)
+                checkpoint()
+                results = display_results(week, game_info, season)
                 layout = html.Div([boxscore, results])
             else:
-                layout = display_matchup(game_info)
+                layout = display_matchup(game_info, week, season)
 
 
             outputs[triggered_button_index] = layout
@@ -11,12 +11,62 @@ HEADERS = {
     'accept': 'application/json',
     'Authorization': f'Bearer {API_KEY}'
 }
-YEAR = '2024'
-GAMES_URL = "https://api.collegefootballdata.com/games"
-MEDIA_URL = "https://api.collegefootballdata.com/games/media"
-ODDS_URL = "https://api.collegefootballdata.com/lines"
-RECORDS_URL = f'https://api.collegefootballdata.com/records'
-SCHEDULE_URL = "https://api.collegefootballdata.com/calendar"
-SCOREBOARD_URL = "https://api.collegefootballdata.com/scoreboard"
-TEAM_STATS_URL = "https://api.collegefootballdata.com/stats/season"
-GAME_STATS_URL = "https://api.collegefootballdata.com/games/teams"
\ No newline at end of file
+YEAR = os.environ.get('YEAR', '2024')
+# SQLite archive of completed weeks and past seasons
+ARCHIVE_PATH = os.environ.get('ARCHIVE_PATH', 'archive/cfb.sqlite3')
+# /metrics is only served when this is set; scrapers send it as a bearer token
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+# Seconds between each worker's write of its metrics for the scraped worker to aggregate
+METRICS_FLUSH = int(os.environ.get('METRICS_FLUSH', 5))
+# Callback profiling: '' (off), 'always', or 'header' (only requests carrying PROFILE_HEADER)
+PROFILE_MODE = os.environ.get('PROFILE_MODE', '').lower()
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_HEADER = 'X-Profile'
+# Opt-in orjson path for API parsing, Dash responses and cache values
+FAST_JSON = os.environ.get('FAST_JSON', '').lower() in ('1', 'true', 'yes')
+# Callback/page responses smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+# Resized team-logo thumbnails served by /logos
+LOGO_CACHE_DIR = os.environ.get('LOGO_CACHE_DIR', 'logo-cache')
+# Games rendered with the week list's first response, then per pager tick
+GAMES_FIRST_PAGE = int(os.environ.get('GAMES_FIRST_PAGE', 12))
+GAMES_PAGE = int(os.environ.get('GAMES_PAGE', 24))
+# Kickoff times render in this zone until the browser reports its own
+DEFAULT_TIMEZONE = os.environ.get('DEFAULT_TIMEZONE', 'US/Eastern')
+# Snapshot files shared by all workers on a dyno (tmpfs when available)
+SHARED_DIR = os.environ.get('SHARED_DIR', '/dev/shm/cfb-dash' if os.path.isdir('/dev/shm') else 'shared-snapshot')
+# Seconds between scoreboard refreshes by the worker that publishes it
+SCOREBOARD_REFRESH = int(os.environ.get('SCOREBOARD_REFRESH', 15))
+# Line changes kept per game and provider in the betting-line history
+LINE_HISTORY_SIZE = int(os.environ.get('LINE_HISTORY_SIZE', 48))
+# Background callback jobs: state and results shared by the workers, and how long a finished
+# week list or recap is reused for identical requests
+JOBS_DIR = os.environ.get('JOBS_DIR', 'job-cache')
+JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 30))
+# Seconds before the live team records are rebased on a full-season records fetch
+RECORDS_BASELINE_MAX_AGE = int(os.environ.get('RECORDS_BASELINE_MAX_AGE', 3600))
+# Seconds between checks for newly completed weeks to fold into the season stats
+SEASON_STATS_REFRESH = int(os.environ.get('SEASON_STATS_REFRESH', 900))
+# Warm-restart snapshot of computed state; point at a mounted volume to survive dyno restarts ('' disables)
+WARM_SNAPSHOT_PATH = os.environ.get('WARM_SNAPSHOT_PATH', 'warm-snapshot/state.bin')
+WARM_SNAPSHOT_INTERVAL = int(os.environ.get('WARM_SNAPSHOT_INTERVAL', 600))
+# Snapshots older than this are ignored at boot
+WARM_SNAPSHOT_MAX_AGE = int(os.environ.get('WARM_SNAPSHOT_MAX_AGE', 12 * 3600))
+# Pre-rendered payloads of completed weeks, served without running their callbacks ('' disables)
+STATIC_WEEKS_DIR = os.environ.get('STATIC_WEEKS_DIR', 'static-weeks')
+# Seconds between the writer's checks for newly completed weeks to render
+STATIC_WEEKS_INTERVAL = int(os.environ.get('STATIC_WEEKS_INTERVAL', 300))
+# Viewer zones whose game lists are rendered ahead; other zones go through the callbacks
+STATIC_WEEKS_ZONES = [zone for zone in os.environ.get(
+    'STATIC_WEEKS_ZONES', 'America/New_York,America/Chicago,America/Denver,America/Los_Angeles').split(',') if zone]
+# Overridable so benchmarks and load tests can point the app at a local stub
+API_BASE_URL = os.environ.get('API_BASE_URL', "https://api.collegefootballdata.com").rstrip('/')
+GAMES_URL = f"{API_BASE_URL}/games"
+MEDIA_URL = f"{API_BASE_URL}/games/media"
+ODDS_URL = f"{API_BASE_URL}/lines"
+RECORDS_URL = f'{API_BASE_URL}/records'
+SCHEDULE_URL = f"{API_BASE_URL}/calendar"
+SCOREBOARD_URL = f"{API_BASE_URL}/scoreboard"
+TEAM_STATS_URL = f"{API_BASE_URL}/stats/season"
+GAME_STATS_URL = f"{API_BASE_URL}/games/teams"
+RANKINGS_URL = f"{API_BASE_URL}/rankings"
\ No newline at end of file
@@ -0,0 +1,102 @@
+# filters.py
+# Server-side filters for the week's game list. An index over the week's Game records (conference,
+# team, TV outlet, ranked, completed) is built once per week and memoized like the other per-week
+# transforms; each active filter then resolves to a set of game ids, so only matching games are
+# rendered and sent to the browser.
+import json
+from functools import lru_cache
+from metrics import memoize
+
+STATUS_OPTIONS = [
+    {'label': 'Live', 'value': 'live'},
+    {'label': 'Scheduled', 'value': 'scheduled'},
+    {'label': 'Completed', 'value': 'completed'},
+]
+
+
+@lru_cache(maxsize=None)
+def _team_info():
+    with open('data/team_info.json', 'r') as file:
+        return json.load(file)
+
+
+@lru_cache(maxsize=None)
+def team_conferences():
+    # Team id -> conference, read once per process
+    return {team['id']: team['conference'] for team in _team_info() if team.get('conference')}
+
+
+def conference_options():
+    conferences = sorted({team['conference'] for team in _team_info()
+                          if team.get('classification') == 'fbs' and team.get('conference')})
+    return [{'label': conference, 'value': conference} for conference in conferences]
+
+
+def team_options():
+    # Every FBS team rather than only this week's, so a selected team survives week changes
+    teams = sorted((team['school'], team['id']) for team in _team_info() if team.get('classification') == 'fbs')
+    return [{'label': school, 'value': team_id} for school, team_id in teams]
+
+
+def _add(index, key, game_id):
+    ids = index.setdefault(key, [])
+    if not ids or ids[-1] != game_id:  # Conference games list both teams under the same key
+        ids.append(game_id)
+
+
+# Builds the per-week lookup tables. Keys are strings and values lists so the cached value stays JSON
+@memoize(timeout=3600)
+def build_game_index(games, ranked_teams):
+    conferences = team_conferences()
+    ranked_teams = set(ranked_teams)
+    index = {'ids': [], 'conference': {}, 'team': {}, 'outlet': {}, 'ranked': [], 'completed': []}
+    for game in games:
+        game_id = game.id
+        index['ids'].append(game_id)
+        for team_id in (game.home_id, game.away_id):
+            _add(index['team'], str(team_id), game_id)
+            conference = conferences.get(team_id)
+            if conference:
+                _add(index['conference'], conference, game_id)
+        # get_media joins a game's outlets with ', '
+        for outlet in (game.outlet or 'N/A').split(', '):
+            _add(index['outlet'], outlet, game_id)
+        if game.home_team in ranked_teams or game.away_team in ranked_teams:
+            index['ranked'].append(game_id)
+        if game.completed:
+            index['completed'].append(game_id)
+    return index
+
+
+def outlet_options(index):
+    return [{'label': outlet, 'value': outlet} for outlet in sorted(index['outlet'])]
+
+
+def _lookup(table, keys):
+    return {game_id for key in keys for game_id in table.get(key, [])}
+
+
+def _status(game_id, live_ids, completed):
+    if game_id in live_ids:
+        return 'live'
+    return 'completed' if game_id in completed else 'scheduled'
+
+
+def matching_ids(index, live_ids, conferences=None, teams=None, statuses=None, outlets=None, ranked=False):
+    # Ids matching every active filter (any selected value within a filter), or None if none is active
+    candidates = []
+    if conferences:
+        candidates.append(_lookup(index['conference'], conferences))
+    if teams:
+        candidates.append(_lookup(index['team'], [str(team) for team in teams]))
+    if outlets:
+        candidates.append(_lookup(index['outlet'], outlets))
+    if ranked:
+        candidates.append(set(index['ranked']))
+    if statuses:
+        live_ids, completed = set(live_ids), set(index['completed'])
+        candidates.append({game_id for game_id in index['ids']
+                           if _status(game_id, live_ids, completed) in statuses})
+    if not candidates:
+        return None
+    return set.intersection(*candidates)
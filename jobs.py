@@ -0,0 +1,181 @@
+# jobs.py
+# Background execution for the slow callbacks (a cold week's game list, recaps that need game
+# stats), so a request returns at once and the browser polls for the result instead of holding a
+# greenlet and the spinner for the whole upstream latency. This is a Dash background-callback
+# manager backed by a diskcache shared by every worker, so no broker is needed. Jobs run on a
+# thread (a greenlet under gunicorn's gevent workers) in the worker that took the request rather
+# than in a forked process, which would inherit the worker's accept loop and snapshot writer.
+# - Identical requests (same callback and inputs within JOB_RESULT_TTL) share one job and result.
+# - A job is cancelled once every request waiting on it has moved on (e.g. switched weeks); the
+#   callback stops at its next report() or checkpoint(). Each request gets its own waiter id,
+#   "<job>.<token>", which the browser polls with, so Dash's repeated terminate_job calls for one
+#   request only ever remove that request.
+# - Results are kept as JSON, so polls don't unpickle component trees and figures.
+import contextvars
+import os
+import threading
+import time
+import uuid
+import diskcache
+import dash._callback as dash_callback
+from dash import DiskcacheManager
+from dash.long_callback.managers import BaseLongCallbackManager
+from dash.exceptions import PreventUpdate
+from config import JOBS_DIR, JOB_RESULT_TTL
+from metrics import callback_name, record_job
+from profiling import job_profile
+from serialization import loads
+
+RUNNING, DONE, CANCELLED = 'running', 'done', 'cancelled'
+
+_current = threading.local()
+
+
+class JobCancelled(PreventUpdate):
+    pass
+
+
+class EncodedResult(str):
+    # A callback's output already serialized to JSON
+    pass
+
+
+def _split(waiter):
+    job, _, token = (waiter or '').partition('.')
+    return job, token
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobManager(DiskcacheManager):
+    def __init__(self, cache, ttl):
+        # Skips DiskcacheManager.__init__, which requires psutil and multiprocess for forked jobs.
+        # The time bucket in cache_by bounds how long a result is shared
+        BaseLongCallbackManager.__init__(self, [lambda: int(time.time() // ttl)])
+        self.handle = cache
+        self.expire = ttl * 2
+
+    def _state_key(self, job):
+        return f"job-{job}"
+
+    def _state(self, job):
+        return self.handle.get(self._state_key(job)) if job else None
+
+    def cancelled(self, job):
+        state = self._state(job)
+        return state is not None and state['status'] == CANCELLED
+
+    def make_job_fn(self, fn, progress, key=None):
+        # Callbacks keep their signatures; progress goes through report() instead of an argument
+        def job_body(*args, **kwargs):
+            if progress:
+                _current.set_progress, *args = args
+            output = fn(*args, **kwargs)
+            return EncodedResult(dash_callback.to_json(output))
+        return super().make_job_fn(job_body, progress, key)
+
+    def call_job_fn(self, key, job_fn, args, context):
+        with self.handle.transact():
+            job = self.handle.get(f"{key}-job")
+            state = self._state(job)
+            # Finished jobs are shared only for real output, not errors or cancellations
+            token = uuid.uuid4().hex[:12]
+            if state and ((state['status'] == DONE and isinstance(self.handle.get(key), EncodedResult))
+                          or (state['status'] == RUNNING and _alive(state['pid']))):
+                state['waiting'].add(token)
+                self.handle.set(self._state_key(job), state, expire=self.expire)
+                return f"{job}.{token}"
+            job = uuid.uuid4().hex
+            self.handle.delete(key)  # A result left by a cancelled or crashed job
+            self.handle.set(self._state_key(job), {'status': RUNNING, 'pid': os.getpid(), 'key': key,
+                                                   'waiting': {token}}, expire=self.expire)
+            self.handle.set(f"{key}-job", job, expire=self.expire)
+        # A new thread starts with an empty context; the job runs in a copy of the request's, so
+        # profiling and memoize metrics see it as part of the callback
+        request_context = contextvars.copy_context()
+        threading.Thread(target=request_context.run,
+                         args=(self._run, job, key, job_fn, args, context, callback_name()),
+                         name=f"job-{job}", daemon=True).start()
+        return f"{job}.{token}"
+
+    def _run(self, job, key, job_fn, args, context, callback):
+        _current.job, _current.manager, _current.set_progress = job, self, None
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            with job_profile(callback):
+                job_fn(key, self._make_progress_key(key), args, context)
+        finally:
+            with self.handle.transact():
+                state = self._state(job) or {}
+                if state.get('status') == CANCELLED:
+                    self.handle.delete(key)
+                    outcome = 'cancelled'
+                else:
+                    state['status'] = DONE
+                    self.handle.set(self._state_key(job), state, expire=self.expire)
+                    self.handle.touch(key, expire=self.expire)
+                    result = self.handle.get(key)
+                    if isinstance(result, EncodedResult):
+                        outcome = 'ok'
+                    elif isinstance(result, dict) and 'long_callback_error' not in result:
+                        outcome = 'no_update'
+            # The request-level callback latency only covers dispatch and polls
+            record_job(callback, outcome, time.perf_counter() - start)
+
+    def terminate_job(self, waiter):
+        # Dash calls this when a request stops waiting on a job (result delivered, or the viewer
+        # triggered the callback again), possibly more than once per request; the job is only
+        # cancelled once nobody is waiting
+        job, token = _split(waiter)
+        if not job:
+            return
+        with self.handle.transact():
+            state = self._state(job)
+            if state is None or token not in state['waiting']:
+                return
+            state['waiting'].discard(token)
+            # A job whose result is already stored is finishing, not abandoned
+            if not state['waiting'] and state['status'] == RUNNING and state['key'] not in self.handle:
+                state['status'] = CANCELLED
+            self.handle.set(self._state_key(job), state, expire=self.expire)
+
+    def job_running(self, waiter):
+        state = self._state(_split(waiter)[0])
+        return state is not None and state['status'] == RUNNING and _alive(state['pid'])
+
+    def get_progress(self, key):
+        # Left in place so every request sharing the job sees it
+        return self.handle.get(self._make_progress_key(key))
+
+    def get_result(self, key, job):
+        result = super().get_result(key, job)
+        if isinstance(result, EncodedResult):
+            return loads(result)
+        return result
+
+
+def checkpoint():
+    # Stops the current background job if it was cancelled; a no-op outside one
+    job = getattr(_current, 'job', None)
+    if job is not None and _current.manager.cancelled(job):
+        raise JobCancelled()
+
+
+def report(*values):
+    # Progress for the callback's `progress` outputs, then a cancellation checkpoint
+    set_progress = getattr(_current, 'set_progress', None)
+    if set_progress is not None:
+        set_progress(list(values))
+    checkpoint()
+
+
+job_manager = JobManager(diskcache.Cache(JOBS_DIR), JOB_RESULT_TTL)
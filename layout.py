@@ -1,6 +1,16 @@
 import dash
 from dash import dcc, html
 import dash_bootstrap_components as dbc
+from config import YEAR
+from responses import asset_url
+from filters import STATUS_OPTIONS, conference_options, team_options
+
+filter_style = {
+    "width": "100%",
+    "fontSize": "16px",
+    "borderRadius": "8px",
+    "boxShadow": "0px 4px 8px rgba(0, 0, 0, 0.1)",
+}
 
 
 main_layout = dbc.Container([
@@ -11,11 +21,16 @@ main_layout = dbc.Container([
     dcc.Store(id='week-options-store', data=False),
     dcc.Store(id='scores-data', data=[]),
     dcc.Store(id='games-data', data={}),
+    # IANA timezone reported by the browser, used to render kickoff times
+    dcc.Store(id='viewer-timezone', data=None),
+    # Ids of games not yet rendered for the selected week; drained by the pager interval
+    dcc.Store(id='game-order', data={}),
+    dcc.Interval(id='game-pager', interval=250, n_intervals=0, disabled=True),
 
     dbc.Card([
         dbc.CardBody(
             html.Div([
-                html.Img(src="assets/CFB Logo.png", height="100px", style={"marginRight": "15px"}),
+                html.Img(src=asset_url("CFB Logo.png"), height="100px", style={"marginRight": "15px"}),
                 html.H1("2024/25 College Football Games", style={
                     "display": "inline-block",
                     "verticalAlign": "middle",
@@ -36,7 +51,25 @@ main_layout = dbc.Container([
         "boxShadow": "0px 4px 8px rgba(0, 0, 0, 0.3)",
         "padding": "10px"
     }),
-    dbc.Row(
+    dbc.Row([
+            dbc.Col(
+                dcc.Dropdown(
+                    id='season-selector',
+                    options=[{'label': YEAR, 'value': YEAR}],
+                    value=YEAR,
+                    clearable=False,
+                    style={
+                        "width": "100%",
+                        "textAlign": "center",
+                        "fontSize": "18px",
+                        "padding": "3px",
+                        "border": "none",
+                        "borderRadius": "8px",
+                        "boxShadow": "0px 4px 8px rgba(0, 0, 0, 0.1)",
+                    }
+                ),
+                width=2,
+            ),
             dbc.Col(
                 dcc.Dropdown(
                     id='week-selector',
@@ -55,10 +88,29 @@ main_layout = dbc.Container([
                 ),
                 width=6,  # Adjust width as needed
                 style={"display": "flex", "justifyContent": "center"}  # Center the dropdown in the column
-            ),
+            )],
             justify="center",
             style={"marginBottom": "20px"}
         ),
+    # Server-side filters; the game list only renders games matching all of them
+    dbc.Row([
+        dbc.Col(dcc.Dropdown(id='conference-filter', options=conference_options(), multi=True,
+                             placeholder="Conference", style=filter_style), width=3),
+        dbc.Col(dcc.Dropdown(id='team-filter', options=team_options(), multi=True,
+                             placeholder="Team", style=filter_style), width=3),
+        dbc.Col(dcc.Dropdown(id='status-filter', options=STATUS_OPTIONS, multi=True,
+                             placeholder="Status", style=filter_style), width=2),
+        dbc.Col(dcc.Dropdown(id='outlet-filter', options=[], multi=True,
+                             placeholder="TV", style=filter_style), width=2),
+        dbc.Col(dbc.Checklist(id='ranked-filter', options=[{'label': "Ranked only", 'value': 'ranked'}],
+                              value=[], switch=True), width=2, style={"display": "flex", "alignItems": "center"}),
+    ], justify="center", style={"marginBottom": "20px"}),
+    # Progress of a week that is still being loaded in the background; shown only while it runs
+    dbc.Row(
+        dbc.Col(dbc.Progress(id='week-progress', value=0, label="", striped=True, animated=True,
+                             style={'display': 'none'}), width=12),
+        style={"marginBottom": "10px"}
+    ),
     # Game information loading section
     dbc.Row(
         dbc.Col(
@@ -69,6 +121,10 @@ main_layout = dbc.Container([
             ),
             width=12
         )
+    ),
+    # Later pages are appended outside dcc.Loading so the spinner doesn't cover rendered games
+    dbc.Row(
+        dbc.Col(html.Div(id='more-game-info', children=[]), width=12)
     )
 ], fluid=True)
 
@@ -0,0 +1,129 @@
+# line_history.py
+# Betting-line history for a week: spread, total and moneylines from every provider in the /lines
+# response, kept as one ring buffer of the last `size` changes per (game id, provider). Each fetch
+# is diffed against the series' latest entries, so only lines that moved are appended. Each series'
+# first entry is also kept outside the ring, so the opening line survives once the ring wraps. A
+# week is one NumPy structured array [series, slot] plus its openers and key index, stored as a
+# single archive blob.
+import io
+import numpy as np
+
+ENTRY = np.dtype([('ts', '<f8'), ('spread', '<f4'), ('over_under', '<f4'),
+                  ('home_moneyline', '<f4'), ('away_moneyline', '<f4')])
+# Entry field -> /lines field; missing values are stored as NaN
+FIELDS = {'spread': 'spread', 'over_under': 'overUnder',
+          'home_moneyline': 'homeMoneyline', 'away_moneyline': 'awayMoneyline'}
+
+
+def _value(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _entry_dict(entry):
+    return {name: (None if name != 'ts' and np.isnan(entry[name]) else float(entry[name])) for name in ENTRY.names}
+
+
+class LineHistory:
+    def __init__(self, size, keys=(), entries=None, counts=None, openers=None):
+        self.size = size
+        self.keys = [tuple(key) for key in keys]
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        self.by_game = {}
+        for row, (game_id, _) in enumerate(self.keys):
+            self.by_game.setdefault(game_id, []).append(row)
+        self.entries = entries if entries is not None else np.zeros((0, size), dtype=ENTRY)
+        # Entries ever appended per series; the next slot is counts % size
+        self.counts = counts if counts is not None else np.zeros(0, dtype=np.int64)
+        # First entry ever appended per series
+        self.openers = openers if openers is not None else self._oldest(np.arange(len(self.keys)))
+
+    def _add_series(self, keys):
+        for key in keys:
+            self.rows[key] = len(self.keys)
+            self.by_game.setdefault(key[0], []).append(len(self.keys))
+            self.keys.append(key)
+        self.entries = np.concatenate([self.entries, np.zeros((len(keys), self.size), dtype=ENTRY)])
+        self.counts = np.concatenate([self.counts, np.zeros(len(keys), dtype=np.int64)])
+        self.openers = np.concatenate([self.openers, np.zeros(len(keys), dtype=ENTRY)])
+
+    def _latest(self, rows):
+        return self.entries[rows, (self.counts[rows] - 1) % self.size]
+
+    def _oldest(self, rows):
+        # Oldest entry still in each ring; stands in for openers in blobs written before they were kept
+        slots = np.where(self.counts[rows] > self.size, self.counts[rows] % self.size, 0)
+        return self.entries[rows, slots]
+
+    def append(self, ts, response):
+        # Stores the lines that differ from each series' latest entry; returns how many were stored
+        incoming = {(game['id'], line.get('provider')): [_value(line.get(field)) for field in FIELDS.values()]
+                    for game in response for line in game.get('lines', []) if line.get('provider')}
+        if not incoming:
+            return 0
+        new_keys = [key for key in incoming if key not in self.rows]
+        if new_keys:
+            self._add_series(new_keys)
+        rows = np.array([self.rows[key] for key in incoming])
+        values = np.array(list(incoming.values()), dtype=np.float32)
+        latest = self._latest(rows)
+        latest = np.stack([latest[name] for name in FIELDS], axis=1)
+        same = (latest == values) | (np.isnan(latest) & np.isnan(values))
+        changed = (self.counts[rows] == 0) | ~same.all(axis=1)
+        rows, values = rows[changed], values[changed]
+        slots = self.counts[rows] % self.size
+        self.entries['ts'][rows, slots] = ts
+        for column, name in enumerate(FIELDS):
+            self.entries[name][rows, slots] = values[:, column]
+        first = self.counts[rows] == 0
+        self.openers[rows[first]] = self.entries[rows[first], 0]
+        self.counts[rows] += 1
+        return len(rows)
+
+    def providers(self, game_id):
+        return [self.keys[row][1] for row in self.by_game.get(game_id, [])]
+
+    def series(self, game_id, provider):
+        # Oldest first, as dicts; the ring keeps the last `size` changes
+        row = self.rows.get((game_id, provider))
+        if row is None:
+            return []
+        count = int(self.counts[row])
+        entries = self.entries[row, :count] if count <= self.size else np.roll(self.entries[row], -(count % self.size))
+        return [_entry_dict(entry) for entry in entries]
+
+    def opening(self, game_id, provider):
+        # The series' first line as a dict, even after the ring has dropped it; None if unknown
+        row = self.rows.get((game_id, provider))
+        if row is None or not self.counts[row]:
+            return None
+        return _entry_dict(self.openers[row])
+
+    def consensus(self, game_id):
+        # Median of the providers' current spread and total, or None without lines
+        rows = self.by_game.get(game_id)
+        if not rows:
+            return None
+        latest = self._latest(np.array(rows))
+        medians = {}
+        for name in ('spread', 'over_under'):
+            values = latest[name][~np.isnan(latest[name])]
+            medians[name] = float(np.median(values)) if len(values) else None
+        return {**medians, 'providers': len(rows)}
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez(buffer, entries=self.entries, counts=self.counts, openers=self.openers,
+                 games=np.array([key[0] for key in self.keys], dtype=np.int64),
+                 providers=np.array([str(key[1]) for key in self.keys], dtype=str))
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+            entries = arrays['entries']
+            keys = zip(arrays['games'].tolist(), arrays['providers'].tolist())
+            openers = arrays['openers'] if 'openers' in arrays.files else None
+            return cls(entries.shape[1], keys, entries, arrays['counts'], openers)
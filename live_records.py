@@ -0,0 +1,56 @@
+# live_records.py
+# Current-season W-L records kept up to date from the scoreboard poll. A full-season records
+# fetch is the baseline; every game the scoreboard shows turning completed after that adds a win
+# and a loss (and a conference win and loss when both teams share a conference in team_info), so
+# records move within one poll of a final without downloading the season again.
+import time
+
+INDEPENDENT = 'FBS Independents'
+
+
+class LiveRecords:
+    def __init__(self, baseline, scoreboard, conferences):
+        # Team name -> [total wins, total losses, conference wins, conference losses]
+        self.records = {
+            record['team']: [record['total'].get('wins', 0), record['total'].get('losses', 0),
+                             record['conferenceGames'].get('wins', 0), record['conferenceGames'].get('losses', 0)]
+            for record in baseline
+        }
+        # Game id -> last status seen; games already final at the baseline are counted in it
+        self.statuses = {game['id']: game['status'] for game in scoreboard}
+        self.applied = set()
+        self.conferences = conferences
+        self.created = time.time()
+
+    def age(self):
+        return time.time() - self.created
+
+    def _conference_game(self, home, away):
+        conference = self.conferences.get(home['id'])
+        return conference is not None and conference != INDEPENDENT and conference == self.conferences.get(away['id'])
+
+    def _apply(self, game):
+        home, away = game['homeTeam'], game['awayTeam']
+        if home['points'] is None or away['points'] is None or home['points'] == away['points']:
+            return
+        winner, loser = (home, away) if home['points'] > away['points'] else (away, home)
+        conference_game = self._conference_game(home, away)
+        winner_record = self.records.setdefault(winner['name'], [0, 0, 0, 0])
+        loser_record = self.records.setdefault(loser['name'], [0, 0, 0, 0])
+        winner_record[0] += 1
+        loser_record[1] += 1
+        if conference_game:
+            winner_record[2] += 1
+            loser_record[3] += 1
+
+    def observe(self, scoreboard):
+        # Applies the games that went final since the previous poll
+        for game in scoreboard:
+            previous = self.statuses.get(game['id'])
+            if previous == 'completed':
+                continue  # Final for good; an older scoreboard snapshot must not reopen it
+            self.statuses[game['id']] = game['status']
+            if (game['status'] == 'completed' and previous is not None and previous != 'completed'
+                    and game['id'] not in self.applied):
+                self.applied.add(game['id'])
+                self._apply(game)
@@ -0,0 +1,139 @@
+# logos.py
+# Local team-logo proxy. Each upstream logo is downloaded once, resized to the heights the
+# layout uses and stored as WebP under LOGO_CACHE_DIR/<team>/<version>/, the version being a hash
+# of the upstream URL; the app then serves those thumbnails with immutable cache headers instead
+# of hot-linking full-size third-party images. A new upstream URL gets new files and a new URL.
+#   python logos.py --prebuild   builds thumbnails for every FBS team in data/team_info.json
+import argparse
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import requests
+from flask import abort, redirect, send_file
+from PIL import Image
+from config import LOGO_CACHE_DIR
+import shared
+
+THUMBNAIL_SIZES = (100, 50, 40)
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Seconds to wait before retrying a logo whose download failed
+RETRY_AFTER = 600
+
+_locks = {}
+_locks_guard = threading.Lock()
+_failed = {}
+
+
+def logo_sources():
+    # Team id (as a string) -> upstream logo URL, published to the shared snapshot
+    with open('data/team_info.json', 'r') as file:
+        data = json.load(file)
+    sources = {}
+    for team in data:
+        logos = team.get('logos')
+        if logos:
+            logo = logos[0] if isinstance(logos, list) else logos
+            sources[str(team['id'])] = logo.replace('http://', 'https://')
+    return sources
+
+
+shared.register('team_logos', logo_sources)
+
+
+@lru_cache(maxsize=None)
+def _version(source):
+    return hashlib.sha1(source.encode()).hexdigest()[:8]
+
+
+def logo_src(team_id, size):
+    # URL of a team's thumbnail; the version changes if the upstream logo URL does
+    source = shared.read('team_logos', str(team_id))
+    if source is None:
+        return None
+    return f"/logos/{team_id}/{_version(source)}/{size}.webp"
+
+
+def _thumbnail_path(team_id, version, size):
+    return os.path.join(LOGO_CACHE_DIR, str(team_id), version, f"{size}.webp")
+
+
+def _write_atomic(path, data):
+    # Workers may build the same logo concurrently; the rename makes the last one win cleanly
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as file:
+        file.write(data)
+    os.replace(tmp, path)
+
+
+def build_thumbnails(team_id):
+    source = shared.read('team_logos', str(team_id))
+    if source is None:
+        return False
+    version = _version(source)
+    with _locks_guard:
+        lock = _locks.setdefault(team_id, threading.Lock())
+    with lock:
+        if all(os.path.exists(_thumbnail_path(team_id, version, size)) for size in THUMBNAIL_SIZES):
+            return True
+        # Keyed by version so a changed upstream URL is tried straight away
+        if time.time() - _failed.get((team_id, version), 0) < RETRY_AFTER:
+            return False
+        try:
+            response = requests.get(source, timeout=30)
+            response.raise_for_status()
+            image = Image.open(io.BytesIO(response.content))
+            image.load()
+        except (requests.exceptions.RequestException, OSError) as e:
+            print(f"Error fetching logo for team {team_id}: {e}")
+            _failed[team_id, version] = time.time()
+            return False
+        image = image.convert('RGBA')
+        os.makedirs(os.path.dirname(_thumbnail_path(team_id, version, THUMBNAIL_SIZES[0])), exist_ok=True)
+        for size in THUMBNAIL_SIZES:
+            width = max(1, round(image.width * size / image.height))
+            thumbnail = image.resize((width, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, 'WEBP', quality=85, method=4)
+            _write_atomic(_thumbnail_path(team_id, version, size), buffer.getvalue())
+    return True
+
+
+def init_logos(server):
+    @server.route('/logos/<int:team_id>/<version>/<int:size>.webp')
+    def serve_logo(team_id, version, size):
+        if size not in THUMBNAIL_SIZES:
+            abort(404)
+        source = shared.read('team_logos', str(team_id))
+        if source is None:
+            abort(404)
+        if version != _version(source):
+            # A page rendered before the logo changed; the redirect itself isn't cached for good
+            return redirect(logo_src(team_id, size))
+        path = _thumbnail_path(team_id, version, size)
+        if not os.path.exists(path) and not build_thumbnails(team_id):
+            abort(404)
+        response = send_file(os.path.abspath(path), mimetype='image/webp', conditional=True)
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        return response
+
+
+def prebuild(workers=8):
+    with open('data/team_info.json', 'r') as file:
+        fbs_ids = [team['id'] for team in json.load(file) if team.get('classification') == 'fbs']
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        built = sum(pool.map(build_thumbnails, fbs_ids))
+    print(f"Built thumbnails for {built} of {len(fbs_ids)} FBS teams in {LOGO_CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Team logo thumbnail cache")
+    parser.add_argument('--prebuild', action='store_true', help="Build thumbnails for all FBS teams")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+    if args.prebuild:
+        prebuild(args.workers)
@@ -0,0 +1,342 @@
+# metrics.py
+# Prometheus metrics for the whole dyno. Each worker keeps its own values and writes them every
+# METRICS_FLUSH seconds to SHARED_DIR/metrics-<boot>/<pid>.json; whichever worker is scraped merges
+# every worker's file. Counters and histograms of workers that died stay in the sum so totals never
+# go backwards; gauges and connected clients only count live workers.
+# /metrics is off unless METRICS_TOKEN is set, e.g. for Prometheus:
+#   authorization: {type: Bearer, credentials: <METRICS_TOKEN>}
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from flask import Response, abort, request, g
+from cache_config import cache
+from config import METRICS_TOKEN, METRICS_FLUSH, SHARED_DIR
+import shared
+
+# Latency buckets in seconds, shared by upstream calls and Dash callbacks
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Payload size buckets in bytes
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# A client counts as connected if it polled within this many seconds (interval-scores ticks every 30s)
+CLIENT_WINDOW = 90
+
+_lock = threading.Lock()
+_registry = {}
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = [(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self._values = {}
+
+    def inc(self, *label_values, amount=1):
+        with _lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    @staticmethod
+    def merge(current, value):
+        return value if current is None else current + value
+
+    def samples(self, values):
+        for label_values, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {value}"
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, *label_values):
+        with _lock:
+            self._values[label_values] = (value, time.time())
+
+    @staticmethod
+    def merge(current, value):
+        # Workers set a gauge at different times; the latest reading wins
+        return value if current is None or value[1] > current[1] else current
+
+    def samples(self, values):
+        for label_values, (value, _) in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, label_values)} {value}"
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            counts, total = self._values.get(label_values, ([0] * (len(self.buckets) + 1), 0))
+            counts[index] += 1
+            self._values[label_values] = (counts, total + value)
+
+    @staticmethod
+    def merge(current, value):
+        counts, total = value
+        if current is None:
+            return list(counts), total
+        return [a + b for a, b in zip(current[0], counts)], current[1] + total
+
+    def samples(self, values):
+        for label_values, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(self.label_names, label_values, ('le', le))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, label_values)} {total}"
+            yield f"{self.name}_count{_format_labels(self.label_names, label_values)} {cumulative}"
+
+
+def _register(metric):
+    _registry[metric.name] = metric
+    return metric
+
+
+UPSTREAM_REQUESTS = _register(Counter(
+    'cfb_upstream_requests_total', 'Upstream API calls by endpoint and outcome', ('endpoint', 'outcome')))
+UPSTREAM_LATENCY = _register(Histogram(
+    'cfb_upstream_request_seconds', 'Upstream API call latency by endpoint', ('endpoint',)))
+CACHE_REQUESTS = _register(Counter(
+    'cfb_cache_requests_total', 'Memoized function lookups by result', ('function', 'result')))
+CALLBACK_LATENCY = _register(Histogram(
+    'cfb_callback_seconds', 'Dash callback latency', ('callback',)))
+CALLBACK_PAYLOAD = _register(Histogram(
+    'cfb_callback_response_bytes', 'Dash callback response size', ('callback',), buckets=SIZE_BUCKETS))
+CALLBACK_ERRORS = _register(Counter(
+    'cfb_callback_errors_total', 'Dash callbacks that returned a server error', ('callback',)))
+JOB_DURATION = _register(Histogram(
+    'cfb_job_seconds', 'Background callback job run time by outcome', ('callback', 'outcome')))
+LIVE_GAMES = _register(Gauge(
+    'cfb_live_games', 'Games in progress at the last scoreboard poll'))
+# Counted at scrape time from every live worker's clients; a client's polls may reach any worker
+CONNECTED_CLIENTS = _register(Gauge(
+    'cfb_connected_clients', f'Clients that polled scores in the last {CLIENT_WINDOW}s'))
+
+# Client digest -> epoch seconds of its last score poll
+_clients_last_seen = {}
+
+
+def record_upstream(endpoint, outcome, seconds):
+    UPSTREAM_REQUESTS.inc(endpoint, outcome)
+    UPSTREAM_LATENCY.observe(seconds, endpoint)
+
+
+def record_job(callback, outcome, seconds):
+    JOB_DURATION.observe(seconds, callback, outcome)
+
+
+def set_live_games(count):
+    LIVE_GAMES.set(count)
+
+
+# Memoize wrapper that records hits and misses per function. The inner function only runs
+# on a miss, so a flag set there tells the outer wrapper which way the lookup went.
+_cache_miss = ContextVar('cache_miss', default=None)
+
+
+def memoize(timeout=None):
+    def decorator(func):
+        @wraps(func)
+        def on_miss(*args, **kwargs):
+            flag = _cache_miss.get()
+            if flag is not None:
+                flag.append(True)
+            return func(*args, **kwargs)
+
+        memoized = cache.memoize(timeout=timeout)(on_miss)
+
+        @wraps(memoized)
+        def lookup(*args, **kwargs):
+            flag = []
+            token = _cache_miss.set(flag)
+            try:
+                return memoized(*args, **kwargs)
+            finally:
+                _cache_miss.reset(token)
+                CACHE_REQUESTS.inc(func.__name__, 'miss' if flag else 'hit')
+
+        return lookup
+    return decorator
+
+
+def callback_name():
+    try:
+        body = request.get_json(silent=True) or {}
+    except Exception:
+        return 'unknown'
+    output = body.get('output', 'unknown')
+    # Multi-output callbacks are encoded as "..a.prop...b.prop.."
+    if output.startswith('..'):
+        output = output[2:-2]
+    parts = []
+    for part in output.split('...'):
+        component, _, prop = part.rpartition('.')
+        # Pattern-matching ids are JSON; keep only their type so label cardinality stays small
+        if component.startswith('{'):
+            try:
+                component = json.loads(component).get('type', component)
+            except ValueError:
+                pass
+        parts.append(f"{component}.{prop}")
+    return '+'.join(parts)
+
+
+def _track_client():
+    body = request.get_json(silent=True) or {}
+    if 'interval-scores.n_intervals' not in body.get('changedPropIds', []):
+        return
+    client = f"{request.headers.get('X-Forwarded-For', request.remote_addr)}|{request.user_agent.string}"
+    now = time.time()
+    with _lock:
+        _clients_last_seen[hashlib.sha1(client.encode()).hexdigest()[:16]] = now
+        for key in [k for k, seen in _clients_last_seen.items() if now - seen > CLIENT_WINDOW]:
+            del _clients_last_seen[key]
+
+
+def _worker_dir():
+    # Per boot, so a restarted dyno (or master) doesn't add its predecessor's totals
+    return os.path.join(SHARED_DIR, f"metrics-{shared.boot_id()}")
+
+
+def _flush():
+    with _lock:
+        state = {
+            'metrics': {name: [[list(labels), value] for labels, value in metric._values.items()]
+                        for name, metric in _registry.items() if metric is not CONNECTED_CLIENTS},
+            'clients': dict(_clients_last_seen),
+        }
+    directory = _worker_dir()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{os.getpid()}.json")
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, 'w') as file:
+        json.dump(state, file)
+    os.replace(tmp, path)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(METRICS_FLUSH)
+        try:
+            _flush()
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _worker_states():
+    # (alive, state) per worker, this one's current values included
+    _flush()
+    directory = _worker_dir()
+    for file_name in os.listdir(directory):
+        if not file_name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, file_name)) as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            continue  # Replaced or removed while listing
+        yield _alive(int(file_name[:-len('.json')])), state
+
+
+def _merged():
+    merged = {name: {} for name in _registry}
+    clients = {}
+    for alive, state in _worker_states():
+        for name, entries in state['metrics'].items():
+            metric = _registry.get(name)
+            if metric is None or (metric.kind == 'gauge' and not alive):
+                continue
+            values = merged[name]
+            for labels, value in entries:
+                labels = tuple(labels)
+                values[labels] = metric.merge(values.get(labels), value)
+        if alive:
+            for client, seen in state['clients'].items():
+                clients[client] = max(seen, clients.get(client, 0))
+    now = time.time()
+    merged[CONNECTED_CLIENTS.name] = {(): (sum(1 for seen in clients.values() if now - seen <= CLIENT_WINDOW), now)}
+    return merged
+
+
+def render():
+    try:
+        merged = _merged()
+    except OSError as e:
+        # This worker's values alone are better than no scrape
+        print(f"Error merging worker metrics: {e}")
+        with _lock:
+            merged = {name: dict(metric._values) for name, metric in _registry.items()}
+            merged[CONNECTED_CLIENTS.name] = {(): (len(_clients_last_seen), time.time())}
+    lines = []
+    for metric in _registry.values():
+        lines.append(f"# HELP {metric.name} {metric.description}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples(merged[metric.name]))
+    return "\n".join(lines) + "\n"
+
+
+def init_metrics(server):
+    @server.before_request
+    def start_timer():
+        if request.path.endswith('/_dash-update-component'):
+            g.metrics_start = time.perf_counter()
+            _track_client()
+
+    @server.after_request
+    def record_callback(response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            name = callback_name()
+            CALLBACK_LATENCY.observe(time.perf_counter() - start, name)
+            if not response.direct_passthrough:
+                CALLBACK_PAYLOAD.observe(response.calculate_content_length() or 0, name)
+            if response.status_code >= 500:
+                CALLBACK_ERRORS.inc(name)
+        return response
+
+    if not METRICS_TOKEN:
+        return
+    threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+
+    @server.route('/metrics')
+    def metrics():
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {METRICS_TOKEN}"):
+            abort(401)
+        return Response(render(), mimetype='text/plain; version=0.0.4')
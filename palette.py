@@ -0,0 +1,131 @@
+# palette.py
+# Team colors parsed and validated once per dyno from data/team_info.json and shared between workers
+# (see shared.py), with CIE Lab values so matchup colors are picked by perceptual difference (CIEDE2000) instead of RGB distance.
+import json
+import math
+from functools import lru_cache
+import shared
+
+DEFAULT_COLOR = "#ffffff"
+# ΔE00 below this reads as "the same color" next to each other in the matchup charts
+MIN_DELTA_E = 20
+
+
+def validate_color(color, default=DEFAULT_COLOR):
+    # Default to white if color is invalid
+    if not color or not isinstance(color, str):
+        return default
+    color = color.lstrip("#")
+    if len(color) != 6 or not all(c in '0123456789abcdefABCDEF' for c in color):
+        return default
+    return f"#{color}"
+
+
+def hex_to_rgb(hex_color):
+    hex_color = hex_color.lstrip("#")
+    if len(hex_color) != 6 or not all(c in '0123456789abcdefABCDEF' for c in hex_color):
+        raise ValueError(f"Invalid hex color: {hex_color}")
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _linear(channel):
+    channel /= 255
+    return channel / 12.92 if channel <= 0.04045 else ((channel + 0.055) / 1.055) ** 2.4
+
+
+@lru_cache(maxsize=None)
+def rgb_to_lab(rgb):
+    # sRGB (D65) -> CIE L*a*b*
+    r, g, b = (_linear(channel) for channel in rgb)
+    x = (0.4124 * r + 0.3576 * g + 0.1805 * b) / 0.95047
+    y = 0.2126 * r + 0.7152 * g + 0.0722 * b
+    z = (0.0193 * r + 0.1192 * g + 0.9505 * b) / 1.08883
+
+    def f(t):
+        return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+    fx, fy, fz = f(x), f(y), f(z)
+    return 116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)
+
+
+def delta_e(lab1, lab2):
+    # CIEDE2000 color difference
+    l1, a1, b1 = lab1
+    l2, a2, b2 = lab2
+    c_mean = (math.hypot(a1, b1) + math.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - math.sqrt(c_mean ** 7 / (c_mean ** 7 + 25 ** 7)))
+    a1p, a2p = a1 * (1 + g), a2 * (1 + g)
+    c1p, c2p = math.hypot(a1p, b1), math.hypot(a2p, b2)
+    h1p = math.degrees(math.atan2(b1, a1p)) % 360
+    h2p = math.degrees(math.atan2(b2, a2p)) % 360
+
+    dl, dc = l2 - l1, c2p - c1p
+    dh = 0.0
+    if c1p * c2p:
+        dh = h2p - h1p
+        if dh > 180:
+            dh -= 360
+        elif dh < -180:
+            dh += 360
+    dhh = 2 * math.sqrt(c1p * c2p) * math.sin(math.radians(dh / 2))
+
+    l_mean, cp_mean = (l1 + l2) / 2, (c1p + c2p) / 2
+    h_mean = h1p + h2p
+    if c1p * c2p:
+        if abs(h1p - h2p) > 180:
+            h_mean += 360 if h_mean < 360 else -360
+        h_mean /= 2
+    t = (1 - 0.17 * math.cos(math.radians(h_mean - 30)) + 0.24 * math.cos(math.radians(2 * h_mean))
+         + 0.32 * math.cos(math.radians(3 * h_mean + 6)) - 0.20 * math.cos(math.radians(4 * h_mean - 63)))
+    sl = 1 + 0.015 * (l_mean - 50) ** 2 / math.sqrt(20 + (l_mean - 50) ** 2)
+    sc = 1 + 0.045 * cp_mean
+    sh = 1 + 0.015 * cp_mean * t
+    rt = (-2 * math.sqrt(cp_mean ** 7 / (cp_mean ** 7 + 25 ** 7))
+          * math.sin(math.radians(60 * math.exp(-((h_mean - 275) / 25) ** 2))))
+    return math.sqrt((dl / sl) ** 2 + (dc / sc) ** 2 + (dhh / sh) ** 2 + rt * (dc / sc) * (dhh / sh))
+
+
+def team_palette():
+    # School -> {'color', 'alt_color'} (validated hex) plus their Lab values; published to the shared
+    # snapshot rather than held by every worker
+    with open('data/team_info.json', 'r') as file:
+        data = json.load(file)
+    palette = {}
+    for team in data:
+        color = validate_color(team.get('color'))
+        alt_color = validate_color(team.get('alternateColor'))
+        palette[team['school']] = {
+            'color': color,
+            'alt_color': alt_color,
+            'lab': rgb_to_lab(hex_to_rgb(color)),
+            'alt_lab': rgb_to_lab(hex_to_rgb(alt_color)),
+        }
+    return palette
+
+
+shared.register('team_colors', team_palette)
+
+
+def team_colors(school):
+    return shared.read('team_colors', school)
+
+
+def _team_colors(school):
+    colors = team_colors(school)
+    if colors is None:
+        lab = rgb_to_lab(hex_to_rgb(DEFAULT_COLOR))
+        return [(DEFAULT_COLOR, lab)]
+    return [(colors['color'], colors['lab']), (colors['alt_color'], colors['alt_lab'])]
+
+
+# Display colors for a matchup: primaries unless they are too close, then the first alternate pairing
+# (home alternate first, as before) that separates them, else the most distinct pairing
+@lru_cache(maxsize=4096)
+def matchup_colors(home_team, away_team):
+    home, away = _team_colors(home_team), _team_colors(away_team)
+    pairings = [(h, a) for a in away for h in home]
+    for (home_color, home_lab), (away_color, away_lab) in pairings:
+        if delta_e(home_lab, away_lab) >= MIN_DELTA_E:
+            return home_color, away_color
+    (home_color, _), (away_color, _) = max(pairings, key=lambda pair: delta_e(pair[0][1], pair[1][1]))
+    return home_color, away_color
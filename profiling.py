@@ -0,0 +1,220 @@
+# profiling.py
+# Opt-in per-callback profiling. With PROFILE_MODE unset nothing here is hooked in:
+# `stage` returns a shared null context and `profiled` returns the function unchanged.
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from flask import request, g
+try:
+    from greenlet import getcurrent
+except ImportError:  # Without gevent each request runs on its own thread
+    from threading import get_ident as getcurrent
+from config import PROFILE_MODE, PROFILE_DIR, PROFILE_HEADER
+
+PROFILING = PROFILE_MODE in ('always', 'header')
+
+_active = ContextVar('active_profile', default=None)
+_NULL_STAGE = nullcontext()
+# sys.setprofile is per OS thread, which every greenlet of a gevent worker shares: the tracer
+# drops events from greenlets other than the one it profiles, and only one request per worker
+# installs it at a time; others run untraced while this is held
+_tracing = threading.Lock()
+# Distinguishes profiles of the same callback written within the same second
+_sequence = itertools.count()
+# Seconds a background job waits for the request that started it to release the tracer
+JOB_TRACE_WAIT = 1.0
+
+
+class _StackTracer:
+    # Deterministic tracer that accumulates self time per full call stack, written out in the
+    # "folded" format read by flamegraph.pl, speedscope and inferno. Only the greenlet that created
+    # it is recorded; time it spends switched out counts towards the call it was waiting in.
+    def __init__(self):
+        self.stack = []  # [path, start_ns, child_ns]
+        self.folded = {}
+        self.owner = getcurrent()
+
+    def __call__(self, frame, event, arg):
+        if getcurrent() != self.owner:
+            return
+        now = time.perf_counter_ns()
+        if event == 'call' or event == 'c_call':
+            if event == 'call':
+                code = frame.f_code
+                label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            else:
+                label = getattr(arg, '__qualname__', None) or getattr(arg, '__name__', repr(arg))
+            path = f"{self.stack[-1][0]};{label}" if self.stack else label
+            self.stack.append([path, now, 0])
+        elif self.stack:
+            # Returns for frames entered before tracing started are ignored (the stack is empty)
+            path, start, child = self.stack.pop()
+            elapsed = now - start
+            self.folded[path] = self.folded.get(path, 0) + elapsed - child
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+    def write(self, file_name):
+        with open(file_name, 'w') as file:
+            for path, nanos in self.folded.items():
+                micros = nanos // 1000
+                if micros:
+                    file.write(f"{path} {micros}\n")
+
+
+class _Profile:
+    def __init__(self, callback):
+        self.callback = callback
+        self.start = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+        self.tracer = _StackTracer()
+
+
+class _Stage:
+    __slots__ = ('name', 'profile', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.profile = _active.get()
+        if self.profile is not None:
+            self.profile.depth += 1
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        profile = self.profile
+        if profile is not None:
+            profile.depth -= 1
+            profile.spans.append({
+                'stage': self.name,
+                'depth': profile.depth,
+                'start_ms': round((self.start - profile.start) * 1000, 3),
+                'duration_ms': round((time.perf_counter() - self.start) * 1000, 3),
+            })
+        return False
+
+
+def stage(name):
+    if not PROFILING:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def profiled(name):
+    # Decorator form of `stage` for whole functions
+    def decorator(func):
+        if not PROFILING:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _file_safe(output):
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in output).strip('_')[:80]
+
+
+def _callback_name():
+    body = request.get_json(silent=True) or {}
+    return _file_safe(body.get('output', 'unknown'))
+
+
+def _write_profile(profile, total_seconds):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_sequence)}-{profile.callback}")
+    profile.tracer.write(f"{base}.folded")
+    total_ms = round(total_seconds * 1000, 3)
+    top_level_ms = sum(span['duration_ms'] for span in profile.spans if span['depth'] == 0)
+    with open(f"{base}.json", 'w') as file:
+        json.dump({
+            'callback': profile.callback,
+            'total_ms': total_ms,
+            'unattributed_ms': round(total_ms - top_level_ms, 3),
+            'spans': sorted(profile.spans, key=lambda span: span['start_ms']),
+        }, file, indent=2)
+
+
+@contextmanager
+def job_profile(callback):
+    # Profiles a background job's body as its own profile when the request that started it was
+    # traced (the job runs in a copy of that request's context)
+    if not PROFILING or _active.get() is None or not _tracing.acquire(timeout=JOB_TRACE_WAIT):
+        yield
+        return
+    profile = _Profile(f"job-{_file_safe(callback)}")
+    token = _active.set(profile)
+    sys.setprofile(profile.tracer)
+    try:
+        yield
+    finally:
+        sys.setprofile(None)
+        _active.reset(token)
+        _tracing.release()
+        try:
+            _write_profile(profile, time.perf_counter() - profile.start)
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+
+
+def _wrap_serializer():
+    # Dash serializes callback output inside its dispatch view; time it as its own stage
+    import dash._callback as dash_callback
+    to_json = dash_callback.to_json
+
+    @wraps(to_json)
+    def timed_to_json(value):
+        with _Stage('serialize'):
+            return to_json(value)
+    dash_callback.to_json = timed_to_json
+
+
+def init_profiling(server):
+    if not PROFILING:
+        return
+    _wrap_serializer()
+
+    @server.before_request
+    def start_profile():
+        if not request.path.endswith('/_dash-update-component'):
+            return
+        if PROFILE_MODE == 'header' and not request.headers.get(PROFILE_HEADER):
+            return
+        if not _tracing.acquire(blocking=False):
+            return
+        profile = _Profile(_callback_name())
+        g.profile_token = _active.set(profile)
+        sys.setprofile(profile.tracer)
+
+    @server.after_request
+    def finish_profile(response):
+        token = g.pop('profile_token', None)
+        if token is not None:
+            sys.setprofile(None)
+            profile = _active.get()
+            _active.reset(token)
+            _tracing.release()
+            try:
+                _write_profile(profile, time.perf_counter() - profile.start)
+            except OSError as e:
+                print(f"Error writing profile: {e}")
+        return response
+
+    @server.teardown_request
+    def abandon_profile(exc):
+        # A request that failed before after_request still gives up the tracer
+        if g.pop('profile_token', None) is not None:
+            sys.setprofile(None)
+            _tracing.release()
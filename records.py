@@ -0,0 +1,97 @@
+# records.py
+# Compact slotted records for the week pipeline. Games, betting lines, media, team records and
+# scoreboard entries travel between the fetch/merge stages as these objects and become plain dicts
+# (the shape the Dash stores and callbacks read) only when handed to Dash.
+from dataclasses import dataclass, fields
+
+
+def _field_names(cls):
+    cls.FIELDS = tuple(field.name for field in fields(cls))
+    return cls
+
+
+class Record:
+    __slots__ = ()
+    FIELDS = ()
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+@_field_names
+@dataclass(slots=True)
+class Game(Record):
+    id: int
+    start_timestamp: int
+    home_team: str
+    home_id: int
+    away_team: str
+    away_id: int
+    home_points: int
+    home_line_scores: list
+    away_points: int
+    completed: bool
+    # Team data, filled in by create_home_away_teams
+    home_team_mascot: str = 'N/A'
+    away_team_mascot: str = 'N/A'
+    home_team_logo: str = 'N/A'
+    away_team_logo: str = 'N/A'
+    home_team_color: str = '#ffffff'
+    away_team_color: str = '#ffffff'
+    home_team_alt_color: str = '#ffffff'
+    # Betting, media and team records, joined in create_display
+    spread: str = 'N/A'
+    over_under: object = 'N/A'
+    outlet: str = 'N/A'
+    home_total_wins: object = 'N/A'
+    home_total_losses: object = 'N/A'
+    home_conference_wins: object = 'N/A'
+    home_conference_losses: object = 'N/A'
+    away_total_wins: object = 'N/A'
+    away_total_losses: object = 'N/A'
+    away_conference_wins: object = 'N/A'
+    away_conference_losses: object = 'N/A'
+
+
+@_field_names
+@dataclass(slots=True)
+class Line(Record):
+    id: int
+    spread: str
+    over_under: object
+
+
+@_field_names
+@dataclass(slots=True)
+class Media(Record):
+    id: int
+    outlet: str
+
+
+@_field_names
+@dataclass(slots=True)
+class TeamRecord(Record):
+    team: str
+    total_wins: int
+    total_losses: int
+    conference_wins: int
+    conference_losses: int
+
+
+@_field_names
+@dataclass(slots=True)
+class ScoreboardGame(Record):
+    game_id: int
+    home_id: int
+    away_id: int
+    home_team: str
+    away_team: str
+    status: str
+    period: object
+    clock: object
+    tv: object
+    situation: object
+    possession: object
+    home_team_score: object
+    away_team_score: object
+    spread: object
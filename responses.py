@@ -0,0 +1,125 @@
+# responses.py
+# Compression and cache headers for responses served by the Flask server.
+import gzip
+import hashlib
+import os
+import threading
+import zlib
+from functools import lru_cache
+from urllib.parse import quote
+from flask import request
+from config import COMPRESS_MIN_BYTES, SHARED_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSETS_DIR = 'assets'
+COMPRESSIBLE_TYPES = ('application/json', 'text/html', 'text/css', 'text/plain', 'application/javascript',
+                      'text/javascript')
+# Fingerprinted assets never change under the same URL
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# Assets referenced without a fingerprint (e.g. url() inside styles.css) revalidate via ETag after a week
+REVALIDATE = 'public, max-age=604800, stale-while-revalidate=86400'
+# Responses cached for a year (fingerprinted assets and Dash's component bundles) don't change, so
+# each is compressed once per dyno at higher levels and kept here for every worker. Brotli 11 would
+# take ~12 s on a 4.5 MB bundle against ~0.5 s at 9 for a 10% smaller file
+STATIC_COMPRESSION = {'br': 9, 'gzip': 9}
+COMPRESSED_DIR = os.path.join(SHARED_DIR, 'compressed')
+
+# (path, body checksum, encoding) -> compressed body, per worker
+_compressed = {}
+
+
+@lru_cache(maxsize=None)
+def _asset_hash(path, mtime):
+    with open(path, 'rb') as file:
+        return hashlib.sha1(file.read()).hexdigest()[:12]
+
+
+def asset_url(name):
+    # Content-hashed URL for a file in assets/, served with a one-year immutable cache policy
+    path = os.path.join(ASSETS_DIR, name)
+    return f"/assets/{quote(name)}?v={_asset_hash(path, os.path.getmtime(path))}"
+
+
+def accepted_encoding():
+    accepted = request.headers.get('Accept-Encoding', '')
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def _encode(body, encoding, level):
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level)
+
+
+def _compress_static(body, encoding):
+    # Keyed by path and content rather than the full URL, so made-up fingerprints in the query
+    # string can't fill the cache
+    key = (request.path, zlib.crc32(body), encoding)
+    compressed = _compressed.get(key)
+    if compressed is not None:
+        return compressed
+    path = os.path.join(COMPRESSED_DIR, hashlib.sha1(repr(key).encode()).hexdigest())
+    try:
+        with open(path, 'rb') as file:
+            compressed = file.read()
+    except OSError:
+        compressed = _encode(body, encoding, STATIC_COMPRESSION[encoding])
+        try:
+            os.makedirs(COMPRESSED_DIR, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as file:
+                file.write(compressed)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Error storing compressed {request.path}: {e}")
+    _compressed[key] = compressed
+    return compressed
+
+
+def _compress(response):
+    static = 'max-age=31536000' in response.headers.get('Cache-Control', '')
+    if ((response.direct_passthrough and not static) or response.status_code not in (200, 201)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_TYPES):
+        return
+    response.vary.add('Accept-Encoding')
+    encoding = accepted_encoding()
+    if encoding is None:
+        return
+    response.direct_passthrough = False  # Fingerprinted files from assets/ are read to compress them
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_BYTES:
+        return
+    if static:
+        compressed = _compress_static(body, encoding)
+    else:
+        # Higher levels cost too much CPU per request
+        compressed = _encode(body, encoding, 5 if encoding == 'br' else 6)
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+
+def _cache_headers(response):
+    if not request.path.startswith('/assets/') or response.status_code not in (200, 304):
+        return
+    # Dash fingerprints auto-loaded CSS/JS with ?m=<mtime>; asset_url adds ?v=<content hash>
+    if 'v' in request.args or 'm' in request.args:
+        response.headers['Cache-Control'] = IMMUTABLE
+    else:
+        response.headers['Cache-Control'] = REVALIDATE
+
+
+def init_responses(server):
+    @server.after_request
+    def optimize_response(response):
+        _cache_headers(response)
+        _compress(response)
+        return response
@@ -0,0 +1,115 @@
+# season_stats.py
+# Season offense/defense stats computed from per-game team stats (the GAME_STATS_URL responses)
+# instead of the hand-refreshed data/*_stats.json files. Yards and points live in NumPy arrays
+# indexed by [side, metric, team, week]; a week's column is filled once the week is final, and
+# per-game averages and ranks for every FBS team come from a few whole-array operations.
+import json
+import numpy as np
+
+SIDES = ('offense', 'defense')
+# Game stats category -> (per-game key, rank key) in get_team_stats' shape; 'points' is a field
+# of the team entry rather than a category
+METRICS = (
+    ('totalYards', 'total_ypg', 'total_rank'),
+    ('rushingYards', 'rush_ypg', 'rush_rank'),
+    ('netPassingYards', 'pass_ypg', 'pass_rank'),
+    ('points', 'scoring_avg', 'scoring_rank'),
+)
+# Week columns allocated up front; grown if the season runs longer
+WEEKS = 16
+
+
+def fbs_team_ids():
+    with open('data/team_info.json', 'r') as file:
+        return sorted(team['id'] for team in json.load(file) if team.get('classification') == 'fbs')
+
+
+def _stat_values(team):
+    stats = {stat['category']: stat['stat'] for stat in team.get('stats', [])}
+    stats['points'] = team.get('points')
+    values = []
+    for category, _, _ in METRICS:
+        try:
+            values.append(float(stats.get(category) or 0))
+        except (TypeError, ValueError):
+            values.append(0.0)
+    return values
+
+
+def competition_ranks(values, active):
+    # 1-based ranks along the last axis, lowest value first, ties sharing the best rank (1, 2, 2, 4).
+    # Inactive entries sort last and are reported as 0
+    keys = np.where(active, values, np.inf)
+    order = np.argsort(keys, axis=-1, kind='stable')
+    ordered = np.take_along_axis(keys, order, axis=-1)
+    positions = np.broadcast_to(np.arange(keys.shape[-1]), keys.shape)
+    starts = np.where(np.diff(ordered, axis=-1, prepend=-np.inf) != 0, positions, 0)
+    ranks = np.empty(keys.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, np.maximum.accumulate(starts, axis=-1) + 1, axis=-1)
+    return np.where(active, ranks, 0)
+
+
+class SeasonStats:
+    def __init__(self, team_ids, weeks=WEEKS):
+        self.team_ids = list(team_ids)
+        self.rows = {team_id: row for row, team_id in enumerate(self.team_ids)}
+        self.totals = np.zeros((len(SIDES), len(METRICS), len(self.team_ids), weeks))
+        self.played = np.zeros((len(self.team_ids), weeks), dtype=bool)
+        self.weeks = set()
+
+    def _grow(self, columns):
+        extra = columns - self.played.shape[1]
+        self.totals = np.pad(self.totals, ((0, 0), (0, 0), (0, 0), (0, extra)))
+        self.played = np.pad(self.played, ((0, 0), (0, extra)))
+
+    def ingest_week(self, week, game_stats):
+        # Replaces the week's column, so ingesting a week again is harmless
+        column = int(week) - 1
+        if column >= self.played.shape[1]:
+            self._grow(column + 1)
+        rows, offense, defense = [], [], []
+        for game in game_stats:
+            teams = game.get('teams', [])
+            if len(teams) != 2:
+                continue
+            for team, opponent in (teams, teams[::-1]):
+                row = self.rows.get(team.get('schoolId'))
+                if row is not None:  # FCS opponents only count toward their FBS opponent's stats
+                    rows.append(row)
+                    offense.append(_stat_values(team))
+                    defense.append(_stat_values(opponent))
+        self.totals[..., column] = 0
+        self.played[:, column] = False
+        if rows:
+            # One game per team per week; the team axis moves first under mixed indexing
+            self.totals[0, :, rows, column] = offense
+            self.totals[1, :, rows, column] = defense
+            self.played[rows, column] = True
+        self.weeks.add(int(week))
+
+    def compute(self):
+        # Games played per team, per-game averages and ranks, each shaped [side, metric, team]
+        games = self.played.sum(axis=1)
+        active = games > 0
+        averages = np.divide(self.totals.sum(axis=-1), games, out=np.zeros(self.totals.shape[:-1]), where=active)
+        # Offense ranks the most per game first, defense the fewest allowed
+        direction = np.array([-1.0, 1.0]).reshape(len(SIDES), 1, 1)
+        return games, averages, competition_ranks(averages * direction, active)
+
+    def records(self):
+        # Team id (as a string) -> {'offense': {...}, 'defense': {...}}; empty until a week is ingested
+        if not self.weeks:
+            return {}
+        _, averages, ranks = self.compute()
+        averages, ranks = np.round(averages, 1).tolist(), ranks.tolist()
+        records = {}
+        for row, team_id in enumerate(self.team_ids):
+            team = {}
+            for side_index, side in enumerate(SIDES):
+                stats = {'id': team_id}
+                for metric, (_, value_key, rank_key) in enumerate(METRICS):
+                    stats[value_key] = averages[side_index][metric][row]
+                    stats[rank_key] = ranks[side_index][metric][row]
+                team[side] = stats
+            records[str(team_id)] = team
+        return records
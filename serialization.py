@@ -0,0 +1,97 @@
+# serialization.py
+# Opt-in fast JSON path (FAST_JSON=1) backed by orjson. Covers upstream response parsing,
+# Dash request/response bodies and FileSystemCache values. Falls back to the standard
+# library/pickle paths when disabled or when orjson is not installed.
+import json
+import pickle
+from flask.json.provider import DefaultJSONProvider
+from cachelib.serializers import FileSystemSerializer
+from config import FAST_JSON
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if FAST_JSON and orjson is None:
+    print("FAST_JSON is set but orjson is not installed; using the standard json module")
+
+ENABLED = bool(FAST_JSON and orjson is not None)
+
+# First byte of a cache file body records which format follows
+_ORJSON_MARKER = b'J'
+_PICKLE_MARKER = b'P'
+
+
+def loads(data):
+    # Accepts str, bytes or a memoryview (e.g. a slice of a shared snapshot)
+    if ENABLED:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps(value):
+    # Returns bytes either way
+    if ENABLED:
+        return orjson.dumps(value)
+    return json.dumps(value).encode()
+
+
+def _component_default(value):
+    # orjson calls this for Dash components and Plotly figures, then recurses into the result
+    if hasattr(value, 'to_plotly_json'):
+        return value.to_plotly_json()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dash_to_json(value):
+    # Drop-in for dash._utils.to_json. Plotly's own orjson engine first walks the whole tree in
+    # Python to clean it, which is slower than the json engine for component trees; letting
+    # orjson expand components through `default` avoids that walk.
+    return orjson.dumps(value, default=_component_default, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    # Flask JSON provider so Dash's request.get_json() parses callback state with orjson
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def dumps(self, obj, **kwargs):
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            return super().dumps(obj, **kwargs)
+
+
+class FastCacheSerializer(FileSystemSerializer):
+    # Cached values that are plain JSON are stored with orjson; anything else (non-string keys,
+    # records.py dataclasses, custom objects) falls back to pickle so it comes back as the same type.
+    # Tuples come back as lists, so memoized functions should return lists.
+    def dump(self, value, f, protocol=pickle.HIGHEST_PROTOCOL):
+        try:
+            payload = orjson.dumps(value, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+        except TypeError:
+            f.write(_PICKLE_MARKER)
+            super().dump(value, f, protocol)
+        else:
+            f.write(_ORJSON_MARKER)
+            f.write(payload)
+
+    def load(self, f):
+        marker = f.read(1)
+        if marker == _ORJSON_MARKER:
+            return orjson.loads(f.read())
+        if marker != _PICKLE_MARKER:
+            f.seek(-len(marker), 1)  # Written before FAST_JSON was turned on
+        return super().load(f)
+
+
+def init_serialization(server):
+    if not ENABLED:
+        return
+    # Dash serializes callback output with the to_json imported into its callback module
+    import dash._callback as dash_callback
+    dash_callback.to_json = dash_to_json
+    server.json = FastJSONProvider(server)
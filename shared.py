@@ -0,0 +1,285 @@
+# shared.py
+# Hot read-mostly datasets (team colors and logos, offense/defense stats, the live scoreboard and
+# team records) published as snapshot files under SHARED_DIR (tmpfs by default) that every gunicorn
+# worker maps read-only, so the page cache holds one copy per dyno however many workers run. A snapshot is an
+# index of key -> (offset, length) followed by one JSON blob per key; readers decode only the
+# records they ask for, straight from the mapping.
+# One worker per dyno, elected with a file lock, publishes the datasets at boot and refreshes the
+# periodic ones while readers keep asking for them. Files are replaced atomically, so readers never
+# see a partial snapshot and pick up the new one on their next check.
+import fcntl
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from config import SHARED_DIR
+from serialization import dumps, loads
+
+MAGIC = b'CFBSNAP1'
+# magic, published_at (epoch seconds), index length
+HEADER = struct.Struct('<8sdI')
+# Seconds a reader keeps its mapping before checking whether the file was replaced
+RECHECK = 1.0
+# Readers fall back to building a periodic dataset themselves when the writer is this many
+# refresh intervals behind (e.g. it is busy or died)
+STALE_AFTER = 3
+# The writer stops refreshing a periodic dataset nobody has asked for in this many seconds
+IDLE_AFTER = 120
+# After a reader's rebuild fails (e.g. upstream is down), its worker serves the stale snapshot and
+# waits this long before trying again, doubling per failure up to RETRY_MAX
+RETRY_AFTER = 5
+RETRY_MAX = 300
+
+_datasets = {}
+_snapshots = {}
+_wanted = {}
+_local = {}
+# Dataset -> (monotonic time of the last failed rebuild, seconds to wait before the next)
+_failures = {}
+# Reentrant: a builder may read another dataset (team records read the scoreboard)
+_guard = threading.RLock()
+_writer_lock = None
+_first_boot = None
+
+
+def register(name, build, refresh=None):
+    # build() returns {key: JSON value} (or None on failure). refresh=None means static: built once
+    # at boot; otherwise the writer rebuilds it every `refresh` seconds while it is being read
+    _datasets[name] = (build, refresh)
+
+
+def _path(name):
+    return os.path.join(SHARED_DIR, f"{name}.snap")
+
+
+def publish(name, records):
+    blobs, index, offset = [], {}, 0
+    for key, value in records.items():
+        blob = dumps(value)
+        index[key] = [offset, len(blob)]
+        offset += len(blob)
+        blobs.append(blob)
+    index_blob = dumps(index)
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    path = _path(name)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, time.time(), len(index_blob)))
+        file.write(index_blob)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            self.identity = (stat.st_ino, stat.st_mtime_ns)
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, self.published_at, index_length = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+        self.index = loads(self._view[HEADER.size:HEADER.size + index_length])
+        self._base = HEADER.size + index_length
+        self.checked = time.monotonic()
+
+    def get(self, key, default=None):
+        span = self.index.get(key)
+        if span is None:
+            return default
+        start = self._base + span[0]
+        return loads(self._view[start:start + span[1]])
+
+    def age(self):
+        return time.time() - self.published_at
+
+
+class LocalSnapshot:
+    # In-process stand-in when SHARED_DIR can't be written
+    def __init__(self, records):
+        self.records = records
+        self.published_at = time.time()
+
+    def get(self, key, default=None):
+        return self.records.get(key, default)
+
+    def age(self):
+        return time.time() - self.published_at
+
+
+def snapshot(name):
+    # Current mapping of a dataset, remapped once the file has been replaced; None if unpublished
+    current = _snapshots.get(name)
+    now = time.monotonic()
+    if isinstance(current, Snapshot) and now - current.checked < RECHECK:
+        return current
+    try:
+        stat = os.stat(_path(name))
+    except FileNotFoundError:
+        return _local.get(name)
+    if isinstance(current, Snapshot) and current.identity == (stat.st_ino, stat.st_mtime_ns):
+        current.checked = now
+        return current
+    try:
+        current = Snapshot(_path(name))
+    except (OSError, ValueError) as e:
+        print(f"Error mapping snapshot {name}: {e}")
+        return _local.get(name)
+    # The replaced mapping is released once no reader holds a view into it
+    _snapshots[name] = current
+    return current
+
+
+def _build_and_publish(name):
+    build, _ = _datasets[name]
+    records = build()
+    if records is None:
+        return None
+    try:
+        publish(name, records)
+    except OSError as e:
+        print(f"Error publishing snapshot {name}: {e}")
+        _local[name] = LocalSnapshot(records)
+        return _local[name]
+    return snapshot(name)
+
+
+def _mark_wanted(name, refresh):
+    # Touches <name>.wanted at most every half refresh so the writer knows readers are active
+    now = time.monotonic()
+    if now - _wanted.get(name, 0) < refresh / 2:
+        return
+    _wanted[name] = now
+    path = os.path.join(SHARED_DIR, f"{name}.wanted")
+    try:
+        os.makedirs(SHARED_DIR, exist_ok=True)
+        with open(path, 'a'):
+            os.utime(path)
+    except OSError:
+        pass
+
+
+def _needs_build(current, refresh):
+    return current is None or (refresh is not None and current.age() > refresh * STALE_AFTER)
+
+
+def _backing_off(name):
+    failure = _failures.get(name)
+    return failure is not None and time.monotonic() - failure[0] < failure[1]
+
+
+def _record_attempt(name, succeeded):
+    if succeeded:
+        _failures.pop(name, None)
+        return
+    previous = _failures.get(name)
+    delay = min(previous[1] * 2, RETRY_MAX) if previous else RETRY_AFTER
+    _failures[name] = (time.monotonic(), delay)
+
+
+def read(name, key, default=None):
+    _, refresh = _datasets[name]
+    if refresh is not None:
+        _mark_wanted(name, refresh)
+    current = snapshot(name)
+    if _needs_build(current, refresh) and not _backing_off(name):
+        with _guard:
+            current = snapshot(name)
+            # Greenlets queued behind a failed rebuild don't repeat it
+            if _needs_build(current, refresh) and not _backing_off(name):
+                if refresh is not None:
+                    become_writer()  # The previous writer may have exited
+                built = None
+                try:
+                    built = _build_and_publish(name)
+                finally:
+                    _record_attempt(name, built is not None)
+                current = built or current
+    if current is None:
+        return default
+    return current.get(key, default)
+
+
+def is_writer():
+    return _writer_lock is not None
+
+
+def become_writer():
+    global _writer_lock
+    if _writer_lock is not None:
+        return True
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    lock = open(os.path.join(SHARED_DIR, 'writer.lock'), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return False
+    _writer_lock = lock
+    threading.Thread(target=_refresh_loop, name='shared-snapshot-writer', daemon=True).start()
+    return True
+
+
+def boot_id():
+    # Workers of one gunicorn master share a boot; without gunicorn the process is its own. The
+    # start time tells apart a later process that reuses the pid
+    pid = os.getppid() if 'gunicorn' in sys.modules else os.getpid()
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            started = file.read().rpartition(')')[2].split()[19]
+    except (OSError, IndexError):
+        started = 'unknown'
+    return f"{pid}-{started}"
+
+
+def first_boot():
+    # True in exactly one worker per boot: the first to create the boot's marker file. A worker
+    # gunicorn respawns later (after a timeout kill or crash) may win the writer election, but
+    # finds the marker and leaves the live cache alone
+    global _first_boot
+    if _first_boot is None:
+        try:
+            os.makedirs(SHARED_DIR, exist_ok=True)
+            os.close(os.open(os.path.join(SHARED_DIR, f"boot-{boot_id()}"), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            _first_boot = True
+        except FileExistsError:
+            _first_boot = False
+        except OSError as e:
+            print(f"Error marking boot in {SHARED_DIR}: {e}")
+            _first_boot = is_writer()
+    return _first_boot
+
+
+def _wanted_recently(name):
+    try:
+        return time.time() - os.path.getmtime(os.path.join(SHARED_DIR, f"{name}.wanted")) < IDLE_AFTER
+    except OSError:
+        return False
+
+
+def _refresh_loop():
+    periodic = {name: refresh for name, (_, refresh) in _datasets.items() if refresh is not None}
+    if not periodic:
+        return
+    while True:
+        for name, refresh in periodic.items():
+            current = snapshot(name)
+            if _wanted_recently(name) and (current is None or current.age() >= refresh):
+                try:
+                    _build_and_publish(name)
+                except Exception as e:
+                    print(f"Error refreshing snapshot {name}: {e}")
+        time.sleep(min(periodic.values()) / 2)
+
+
+def init_shared(server):
+    # The elected writer republishes the static datasets so a deploy's data files take effect
+    if not become_writer():
+        return
+    for name, (_, refresh) in _datasets.items():
+        if refresh is None:
+            _build_and_publish(name)
@@ -0,0 +1,376 @@
+# static_weeks.py
+# Pre-rendered completed weeks. Once a week is final and archived, the worker that owns the shared
+# snapshots (see shared.py) renders what viewers ask of it through the app's own callbacks, in a
+# low-priority child process so the work stays off the serving workers:
+# - the game list (first page and every pager page) for each zone in STATIC_WEEKS_ZONES,
+#   precompressed with brotli and gzip
+# - every game's recap (box score and team stats)
+# into STATIC_WEEKS_DIR/<season>/<week>/. Callback requests that match a rendered payload are
+# answered from those files before Dash sees them, so browsing past weeks costs about a static file
+# read. Anything else (filters, other zones, live weeks) goes through the callbacks as before.
+# A week's files are only served by the code that rendered them. Game lists also show the teams'
+# current records, so the current season's are only served while the records they were rendered
+# with are still live; the writer re-renders them when the records move, at cheaper compression
+# levels than past seasons' lists, which are rendered once.
+# Run `python static_weeks.py` to render every archived week now (e.g. in a release phase).
+import gzip
+import hashlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from flask import Response, request
+from dash._utils import stringify_id
+from config import YEAR, STATIC_WEEKS_DIR, STATIC_WEEKS_INTERVAL, STATIC_WEEKS_ZONES
+from responses import accepted_encoding, brotli
+from serialization import dumps, loads
+from utils import get_games, clean_games, create_home_away_teams
+from warmstart import source_version
+import shared
+import store
+
+# Output markers of the callbacks served from rendered weeks (see callbacks.py)
+ITEMS, PAGER, MATCHUP = 'static-game-info.children', 'more-game-info.children@', '"type":"matchup"'
+NO_FILTERS = [('conference-filter', None), ('team-filter', None), ('status-filter', None),
+              ('outlet-filter', None), ('ranked-filter', [])]
+# Seconds between polls of a background callback while rendering
+POLL_INTERVAL = 0.05
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+# (brotli quality, gzip level) for lists rendered once, and for the current season's, re-rendered
+# whenever a final moves the records
+FINAL_COMPRESSION, LIVE_COMPRESSION = (11, 9), (5, 6)
+# Added to the rendering process's niceness so the web workers come first
+RENDER_NICENESS = 10
+
+_outputs = {}
+_manifests = {}
+_rendering = threading.Lock()
+_records_versions = {}
+
+
+def _week_dir(season, week):
+    return os.path.join(STATIC_WEEKS_DIR, str(int(season)), str(int(week)))
+
+
+def _zone_name(zone):
+    return (zone or 'default').replace('/', '_')
+
+
+def _ids_digest(ids):
+    return hashlib.sha1(','.join(map(str, ids)).encode()).hexdigest()[:16]
+
+
+def records_version(season):
+    # Past seasons' records are final; the current season's follow the live team records
+    if str(season) != str(YEAR):
+        return 'final'
+    current = shared.snapshot('team_records')
+    if current is None:
+        return None
+    version = _records_versions.get(current.published_at)
+    if version is None:
+        version = hashlib.sha1(dumps(current.get('teams'))).hexdigest()
+        _records_versions.clear()
+        _records_versions[current.published_at] = version
+    return version
+
+
+def _manifest(season, week):
+    path = os.path.join(_week_dir(season, week), 'manifest.json')
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'rb') as file:
+            cached = _manifests[path] = (mtime, loads(file.read()))
+    return cached[1]
+
+
+def _servable(season, week, lists):
+    if not isinstance(week, int) or not str(season).isdigit():
+        return False
+    manifest = _manifest(season, week)
+    if manifest is None or manifest['source'] != source_version().hex():
+        return False
+    return not lists or manifest['records'] == records_version(season)
+
+
+# Rendering
+
+def _write(path, data):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as file:
+        file.write(data)
+    os.replace(tmp, path)
+
+
+def _write_payload(path, data, season):
+    # Plain JSON plus a copy per encoding, compressed once here rather than per request
+    quality, level = LIVE_COMPRESSION if str(season) == str(YEAR) else FINAL_COMPRESSION
+    _write(path, data)
+    _write(path + ENCODINGS['gzip'], gzip.compress(data, compresslevel=level))
+    if brotli is not None:
+        _write(path + ENCODINGS['br'], brotli.compress(data, quality=quality))
+
+
+def _dispatch(app, payload, args=None):
+    with app.server.test_request_context('/_dash-update-component', method='POST', json=payload,
+                                         query_string=args):
+        return loads(app.dispatch().get_data())
+
+
+def _render(app, marker, inputs, state, changed):
+    # Runs a callback the way the browser calls it, polling background jobs until they finish
+    output = _outputs[marker]
+    if marker == MATCHUP:
+        # One output per game button in the first input
+        outputs = [{'id': {**item['id'], 'type': 'matchup'}, 'property': 'children'} for item in inputs[0]]
+    else:
+        outputs = [_output_spec(part) for part in output[2:-2].split('...')]
+    payload = {'output': output, 'outputs': outputs, 'inputs': inputs,
+               'state': state, 'changedPropIds': changed}
+    body = _dispatch(app, payload)
+    job = {'cacheKey': body.get('cacheKey'), 'job': body.get('job')}
+    while 'response' not in body:
+        time.sleep(POLL_INTERVAL)
+        body = _dispatch(app, payload, job)
+    body.pop('progress', None)
+    return body
+
+
+def _output_spec(part):
+    component, _, prop = part.rpartition('.')
+    return {'id': component, 'property': prop}
+
+
+def _render_lists(app, directory, season, week):
+    for zone in [None, *STATIC_WEEKS_ZONES]:
+        inputs = ([{'id': 'week-selector', 'property': 'value', 'value': week}]
+                  + [{'id': component, 'property': 'value', 'value': value} for component, value in NO_FILTERS])
+        body = _render(app, ITEMS, inputs, [{'id': 'viewer-timezone', 'property': 'data', 'value': zone},
+                                            {'id': 'season-selector', 'property': 'value', 'value': season}],
+                       ['week-selector.value'])
+        _write_payload(os.path.join(directory, f"items-{_zone_name(zone)}.json"), dumps(body), season)
+        game_order, ticks = body['response']['game-order']['data'], 0
+        while game_order.get('ids'):
+            ticks += 1
+            time.sleep(0)  # Yields to requests between pages
+            body = _render(app, PAGER, [{'id': 'game-pager', 'property': 'n_intervals', 'value': ticks}],
+                           [{'id': 'game-order', 'property': 'data', 'value': game_order},
+                            {'id': 'week-selector', 'property': 'value', 'value': week},
+                            {'id': 'viewer-timezone', 'property': 'data', 'value': zone},
+                            {'id': 'season-selector', 'property': 'value', 'value': season}],
+                           ['game-pager.n_intervals'])
+            name = f"page-{_zone_name(zone)}-{_ids_digest(game_order['ids'])}.json"
+            _write_payload(os.path.join(directory, name), dumps(body), season)
+            game_order = body['response']['game-order']['data']
+
+
+def _render_recaps(app, directory, season, week):
+    games = [game.to_dict() for game in create_home_away_teams(clean_games(get_games(week, season)))]
+    for game in games:
+        button = {'index': game['id'], 'type': 'game-button'}
+        time.sleep(0)
+        body = _render(app, MATCHUP,
+                       [[{'id': button, 'property': 'n_clicks', 'value': 1}],
+                        {'id': 'week-selector', 'property': 'value', 'value': week}],
+                       [{'id': 'games-data', 'property': 'data', 'value': games},
+                        [{'id': button, 'property': 'id', 'value': button}],
+                        {'id': 'season-selector', 'property': 'value', 'value': season}],
+                       [f"{stringify_id(button)}.n_clicks"])
+        recap = body['response'][stringify_id({'index': game['id'], 'type': 'matchup'})]['children']
+        # Kept uncompressed: a recap is spliced into a response that also closes the other games
+        _write(os.path.join(directory, f"recap-{game['id']}.json"), dumps(recap))
+
+
+def render_week(app, season, week, recaps=True):
+    # Renders a completed week's payloads; returns False if the records moved while rendering
+    directory = _week_dir(season, week)
+    os.makedirs(directory, exist_ok=True)
+    if str(season) == str(YEAR):
+        shared.read('team_records', 'teams')  # Publishes the live records if nobody has read them yet
+    version = records_version(season)
+    if version is None:
+        return False
+    _render_lists(app, directory, season, week)
+    if recaps:
+        _render_recaps(app, directory, season, week)
+    if records_version(season) != version:
+        return False
+    _write(os.path.join(directory, 'manifest.json'),
+           dumps({'source': source_version().hex(), 'records': version, 'rendered_at': time.time()}))
+    return True
+
+
+def render_pending(app):
+    # Renders archived weeks that have no current payloads; only the game lists when just the
+    # records moved
+    with _rendering:
+        _render_seasons(app)
+
+
+def _render_seasons(app):
+    for season in sorted({str(YEAR), *map(str, store.seasons())}, reverse=True):
+        for week in store.archived_weeks(season):
+            if week['season_type'] != 'regular' or _servable(season, week['week'], lists=True):
+                continue
+            manifest = _manifest(season, week['week'])
+            recaps = manifest is None or manifest['source'] != source_version().hex()
+            try:
+                render_week(app, season, week['week'], recaps)
+            except Exception as e:
+                print(f"Error rendering week {week['week']} of {season}: {e}")
+
+
+def _pending():
+    # Whether any archived week needs rendering; records that haven't been published yet wait for
+    # the next pass rather than starting a render that can't finish
+    for season in sorted({str(YEAR), *map(str, store.seasons())}, reverse=True):
+        for week in store.archived_weeks(season):
+            if week['season_type'] != 'regular':
+                continue
+            manifest = _manifest(season, week['week'])
+            if manifest is None or manifest['source'] != source_version().hex():
+                return True
+            version = records_version(season)
+            if version is not None and manifest['records'] != version:
+                return True
+    return False
+
+
+def _render_process():
+    # The renders run the callbacks and compress their payloads: CPU-bound work that would stall
+    # every request on this worker's event loop
+    try:
+        subprocess.run([sys.executable, os.path.abspath(__file__)], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                       preexec_fn=lambda: os.nice(RENDER_NICENESS))
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Error rendering static weeks: {e}")
+
+
+def _render_loop():
+    # Runs in every worker so a worker elected writer later takes over; sleeps first so a
+    # release-phase `python static_weeks.py` exits before its own loop starts another render
+    while True:
+        time.sleep(STATIC_WEEKS_INTERVAL)
+        if shared.is_writer():
+            try:
+                pending = _pending()
+            except Exception as e:
+                print(f"Error checking static weeks: {e}")
+                continue
+            if pending:
+                _render_process()
+
+
+# Serving
+
+def _file_response(path):
+    encoding = accepted_encoding()
+    suffix = ENCODINGS.get(encoding, '')
+    try:
+        with open(path + suffix, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    response = Response(data, mimetype='application/json')
+    if suffix:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _value(item):
+    return item.get('value') if isinstance(item, dict) else None
+
+
+def _serve_items(body):
+    inputs, state = body['inputs'], body['state']
+    if any(_value(item) for item in inputs[1:]):
+        return None  # Filtered lists go through the callback
+    week, zone, season = _value(inputs[0]), _value(state[0]), _value(state[1])
+    if zone is not None and zone not in STATIC_WEEKS_ZONES:
+        return None
+    if not _servable(season, week, lists=True):
+        return None
+    return _file_response(os.path.join(_week_dir(season, week), f"items-{_zone_name(zone)}.json"))
+
+
+def _serve_page(body):
+    game_order, week, zone, season = (_value(item) for item in body['state'])
+    if not game_order or not game_order.get('ids') or game_order.get('week') != week:
+        return None
+    if str(game_order.get('season')) != str(season):
+        return None  # A tick from before a season switch; the callback drops it
+    if zone is not None and zone not in STATIC_WEEKS_ZONES:
+        return None
+    if not _servable(season, week, lists=True):
+        return None
+    name = f"page-{_zone_name(zone)}-{_ids_digest(game_order['ids'])}.json"
+    return _file_response(os.path.join(_week_dir(season, week), name))
+
+
+def _serve_matchup(body):
+    changed = body.get('changedPropIds') or []
+    if len(changed) != 1 or not changed[0].endswith('.n_clicks'):
+        return None
+    game_id = loads(changed[0].rpartition('.')[0])['index']
+    clicks = next((item.get('value') for item in body['inputs'][0] if item['id']['index'] == game_id), None)
+    week, season = _value(body['inputs'][1]), _value(body['state'][2])
+    if clicks is None or not _servable(season, week, lists=False):
+        return None
+    recap = b'[]'
+    if clicks % 2 == 1:
+        try:
+            with open(os.path.join(_week_dir(season, week), f"recap-{game_id}.json"), 'rb') as file:
+                recap = file.read()
+        except OSError:
+            return None
+    # The clicked game's recap; every other game's is closed, as the callback does
+    entries = [dumps(stringify_id(output['id'])) + b':{"children":'
+               + (recap if output['id']['index'] == game_id else b'[]') + b'}'
+               for output in body['outputs']]
+    return Response(b'{"multi":true,"response":{' + b','.join(entries) + b'}}', mimetype='application/json')
+
+
+def _serve():
+    if not request.path.endswith('/_dash-update-component') or request.args:
+        return None  # Polls of background jobs carry their job in the query string
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return None
+    output = body.get('output')
+    try:
+        if output == _outputs.get(ITEMS):
+            return _serve_items(body)
+        if output == _outputs.get(PAGER):
+            return _serve_page(body)
+        if output == _outputs.get(MATCHUP):
+            return _serve_matchup(body)
+    except (KeyError, IndexError, TypeError, ValueError, AttributeError) as e:
+        print(f"Error serving rendered week: {e}")
+    return None
+
+
+def _find_outputs(app):
+    for marker in (ITEMS, PAGER, MATCHUP):
+        _outputs[marker] = next(output for output in app.callback_map if marker in output)
+
+
+def init_static_weeks(app):
+    if not STATIC_WEEKS_DIR:
+        return
+    _find_outputs(app)
+    app.server.before_request(_serve)
+    threading.Thread(target=_render_loop, name='static-weeks-writer', daemon=True).start()
+
+
+if __name__ == "__main__":
+    # Started by the writer's render loop, or by hand. Uses the app's instance of this module
+    from app import app
+    import static_weeks
+    static_weeks.render_pending(app)
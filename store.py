@@ -0,0 +1,199 @@
+# store.py
+# Local SQLite archive of upstream data, partitioned by season and week. Completed weeks are
+# written once by the fetchers in utils and served from here afterwards without upstream calls.
+# Rows keep the raw API item as JSON next to the indexed columns, so reads return the same
+# shape the fetchers would have received from the API.
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from config import ARCHIVE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weeks (
+    season INTEGER, season_type TEXT, week INTEGER, game_count INTEGER, archived_at TEXT,
+    PRIMARY KEY (season, season_type, week));
+CREATE TABLE IF NOT EXISTS calendar (
+    season INTEGER PRIMARY KEY, data TEXT);
+CREATE TABLE IF NOT EXISTS games (
+    season INTEGER, season_type TEXT, week INTEGER, id INTEGER, start_date TEXT, completed INTEGER,
+    home_id INTEGER, home_team TEXT, home_points INTEGER,
+    away_id INTEGER, away_team TEXT, away_points INTEGER, data TEXT,
+    PRIMARY KEY (season, season_type, week, id));
+CREATE INDEX IF NOT EXISTS games_home ON games (season, home_team);
+CREATE INDEX IF NOT EXISTS games_away ON games (season, away_team);
+CREATE TABLE IF NOT EXISTS line_scores (
+    season INTEGER, season_type TEXT, week INTEGER, game_id INTEGER, side TEXT, period INTEGER, points INTEGER,
+    PRIMARY KEY (season, season_type, week, game_id, side, period));
+CREATE TABLE IF NOT EXISTS lines (
+    season INTEGER, season_type TEXT, week INTEGER, game_id INTEGER, data TEXT,
+    PRIMARY KEY (season, season_type, week, game_id));
+CREATE TABLE IF NOT EXISTS media (
+    season INTEGER, season_type TEXT, week INTEGER, game_id INTEGER, outlet TEXT, data TEXT);
+CREATE INDEX IF NOT EXISTS media_week ON media (season, season_type, week);
+CREATE TABLE IF NOT EXISTS game_stats (
+    season INTEGER, season_type TEXT, week INTEGER, game_id INTEGER, data TEXT,
+    PRIMARY KEY (season, season_type, week, game_id));
+CREATE TABLE IF NOT EXISTS rankings (
+    season INTEGER, season_type TEXT, week INTEGER, data TEXT,
+    PRIMARY KEY (season, season_type, week));
+CREATE TABLE IF NOT EXISTS line_history (
+    season INTEGER, season_type TEXT, week INTEGER, data BLOB,
+    PRIMARY KEY (season, season_type, week));
+CREATE TABLE IF NOT EXISTS records (
+    season INTEGER, team TEXT, data TEXT,
+    PRIMARY KEY (season, team));
+"""
+
+# One connection per process, created (and the schema applied) once. Threads and greenlets take
+# turns on it under _lock; WAL lets gunicorn workers read concurrently
+_lock = threading.RLock()
+_conn = None
+_conn_pid = None
+
+
+def connection():
+    # Callers hold _lock while using the connection (see _fetch and transaction)
+    global _conn, _conn_pid
+    with _lock:
+        if _conn is None or _conn_pid != os.getpid():
+            os.makedirs(os.path.dirname(ARCHIVE_PATH) or '.', exist_ok=True)
+            conn = sqlite3.connect(ARCHIVE_PATH, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            _conn, _conn_pid = conn, os.getpid()
+        return _conn
+
+
+def _fetch(sql, params=(), one=False):
+    with _lock:
+        cursor = connection().execute(sql, params)
+        return cursor.fetchone() if one else cursor.fetchall()
+
+
+@contextmanager
+def transaction():
+    # The connection for one commit-or-rollback block
+    with _lock:
+        conn = connection()
+        with conn:
+            yield conn
+
+
+def week_completed(games):
+    # A week is final once it has games and every one of them is completed
+    return bool(games) and all(game.get('completed') for game in games)
+
+
+def is_archived(season, week, season_type='regular'):
+    row = _fetch(
+        'SELECT 1 FROM weeks WHERE season = ? AND season_type = ? AND week = ?',
+        (int(season), season_type, int(week)), one=True)
+    return row is not None
+
+
+def archive_week(season, week, games, lines, media, game_stats, rankings, season_type='regular'):
+    season, week = int(season), int(week)
+    key = (season, season_type, week)
+    with transaction() as conn:
+        for table in ('games', 'line_scores', 'lines', 'media', 'game_stats'):
+            conn.execute(f'DELETE FROM {table} WHERE season = ? AND season_type = ? AND week = ?', key)
+        conn.executemany(
+            'INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(*key, game['id'], game.get('start_date'), int(bool(game.get('completed'))),
+              game.get('home_id'), game.get('home_team'), game.get('home_points'),
+              game.get('away_id'), game.get('away_team'), game.get('away_points'), json.dumps(game))
+             for game in games])
+        conn.executemany(
+            'INSERT INTO line_scores VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(*key, game['id'], side, period + 1, points)
+             for game in games
+             for side in ('home', 'away')
+             for period, points in enumerate(game.get(f'{side}_line_scores') or [])])
+        conn.executemany('INSERT OR REPLACE INTO lines VALUES (?, ?, ?, ?, ?)',
+                         [(*key, item['id'], json.dumps(item)) for item in lines])
+        conn.executemany('INSERT INTO media VALUES (?, ?, ?, ?, ?, ?)',
+                         [(*key, item['id'], item.get('outlet'), json.dumps(item)) for item in media])
+        conn.executemany('INSERT OR REPLACE INTO game_stats VALUES (?, ?, ?, ?, ?)',
+                         [(*key, item['id'], json.dumps(item)) for item in game_stats])
+        conn.execute('INSERT OR REPLACE INTO rankings VALUES (?, ?, ?, ?)', (*key, json.dumps(rankings)))
+        conn.execute("INSERT OR REPLACE INTO weeks VALUES (?, ?, ?, ?, datetime('now'))", (*key, len(games)))
+
+
+def load_week(table, season, week, season_type='regular'):
+    # Returns the archived raw API items for one of games, lines, media or game_stats
+    if table not in ('games', 'lines', 'media', 'game_stats'):
+        raise ValueError(f"Unknown archive table: {table}")
+    rows = _fetch(
+        f'SELECT data FROM {table} WHERE season = ? AND season_type = ? AND week = ?',
+        (int(season), season_type, int(week)))
+    return [json.loads(row[0]) for row in rows]
+
+
+def load_rankings(season, week, season_type='regular'):
+    # The archived /rankings response for a week, or None if it was archived without one
+    row = _fetch('SELECT data FROM rankings WHERE season = ? AND season_type = ? AND week = ?',
+                 (int(season), season_type, int(week)), one=True)
+    return json.loads(row[0]) if row else None
+
+
+def load_line_history(season, week, season_type='regular'):
+    row = _fetch(
+        'SELECT data FROM line_history WHERE season = ? AND season_type = ? AND week = ?',
+        (int(season), season_type, int(week)), one=True)
+    return row[0] if row else None
+
+
+def update_line_history(season, week, update, season_type='regular'):
+    # update(current blob or None) -> new blob, or None to leave it. Runs under the database write
+    # lock so workers fetching the same week at once don't drop each other's entries
+    key = (int(season), season_type, int(week))
+    with transaction() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        row = conn.execute('SELECT data FROM line_history WHERE season = ? AND season_type = ? AND week = ?',
+                           key).fetchone()
+        data = update(row[0] if row else None)
+        if data is not None:
+            conn.execute('INSERT OR REPLACE INTO line_history VALUES (?, ?, ?, ?)', (*key, data))
+
+
+def save_calendar(season, calendar):
+    with transaction() as conn:
+        conn.execute('INSERT OR REPLACE INTO calendar VALUES (?, ?)', (int(season), json.dumps(calendar)))
+
+
+def load_calendar(season):
+    row = _fetch('SELECT data FROM calendar WHERE season = ?', (int(season),), one=True)
+    return json.loads(row[0]) if row else None
+
+
+def save_records(season, records):
+    with transaction() as conn:
+        conn.executemany('INSERT OR REPLACE INTO records VALUES (?, ?, ?)',
+                         [(int(season), record['team'], json.dumps(record)) for record in records])
+
+
+def load_records(season):
+    rows = _fetch('SELECT data FROM records WHERE season = ?', (int(season),))
+    return [json.loads(row[0]) for row in rows]
+
+
+def seasons():
+    rows = _fetch('SELECT DISTINCT season FROM weeks ORDER BY season DESC')
+    return [row[0] for row in rows]
+
+
+def archived_weeks(season):
+    rows = _fetch(
+        'SELECT season_type, week, game_count FROM weeks WHERE season = ? ORDER BY season_type DESC, week',
+        (int(season),))
+    return [{'season_type': row[0], 'week': row[1], 'games': row[2]} for row in rows]
+
+
+def team_games(season, team):
+    # Archived games for one school in a season, in kickoff order
+    rows = _fetch(
+        'SELECT data FROM games WHERE season = ? AND (home_team = ? OR away_team = ?) ORDER BY start_date',
+        (int(season), team, team))
+    return [json.loads(row[0]) for row in rows]
@@ -0,0 +1,36 @@
+# timezones.py
+# Kickoff times are parsed once when games are cleaned and kept as epoch seconds; rendering turns
+# them into the viewer's local time (reported by the browser) through formatters cached per zone.
+from datetime import datetime
+from functools import lru_cache
+import pytz
+from config import DEFAULT_TIMEZONE
+
+
+def to_timestamp(value):
+    # ISO 8601 from the API ('2024-11-02T16:00:00.000Z' or with an offset) -> epoch seconds
+    if not isinstance(value, str):
+        return None
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=pytz.UTC)
+    return int(moment.timestamp())
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    # Unknown or missing browser zones fall back to DEFAULT_TIMEZONE
+    try:
+        return pytz.timezone(name or DEFAULT_TIMEZONE)
+    except pytz.UnknownTimeZoneError:
+        return pytz.timezone(DEFAULT_TIMEZONE)
+
+
+# Kickoff slots repeat across a week's games, so most lookups are hits
+@lru_cache(maxsize=4096)
+def format_kickoff(timestamp, zone_name=None):
+    # (day of week, 'Nov-02 12:00 PM') in the viewer's zone
+    if timestamp is None:
+        return "TBD", ""
+    local = datetime.fromtimestamp(timestamp, get_zone(zone_name))
+    return local.strftime('%A'), local.strftime('%b-%d %I:%M %p')
@@ -1,12 +1,25 @@
 import json
+import time
 from datetime import datetime
-import pytz
+from functools import lru_cache
 import plotly.graph_objs as go
 from dash import html, dcc
-from api import fetch_data_from_api, load_team_data
+from api import fetch_data_from_api
 from config import (SCHEDULE_URL, SCOREBOARD_URL, GAMES_URL, ODDS_URL,
-                    RECORDS_URL, MEDIA_URL, GAME_STATS_URL, YEAR)
-from cache_config import cache
+                    RECORDS_URL, MEDIA_URL, GAME_STATS_URL, RANKINGS_URL, YEAR, SCOREBOARD_REFRESH,
+                    SEASON_STATS_REFRESH, RECORDS_BASELINE_MAX_AGE, LINE_HISTORY_SIZE)
+from metrics import memoize
+from profiling import profiled
+import store
+from logos import logo_src
+from timezones import to_timestamp
+from palette import team_colors, matchup_colors
+from records import Game, Line, Media, TeamRecord, ScoreboardGame
+from season_stats import SeasonStats, fbs_team_ids
+from live_records import LiveRecords
+from line_history import LineHistory
+from filters import team_conferences
+import shared
 
 
 def format_time(clock):
@@ -34,82 +47,113 @@ def to_numeric(value):
         return 0
 
 
-def hex_to_rgb(hex_color):
-    hex_color = hex_color.lstrip("#")
-    if len(hex_color) != 6 or not all(c in '0123456789abcdefABCDEF' for c in hex_color):
-        raise ValueError(f"Invalid hex color: {hex_color}")
-    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
-
-
-def color_similarity(color1, color2, threshold=100):
-    rgb1 = hex_to_rgb(color1)
-    rgb2 = hex_to_rgb(color2)
-    # Calculate Euclidean distance between two RGB colors
-    return ((rgb1[0] - rgb2[0]) ** 2 + (rgb1[1] - rgb2[1]) ** 2 + (rgb1[2] - rgb2[2]) ** 2) ** 0.5 < threshold
-
-
-@cache.memoize(timeout=3600)
+@memoize(timeout=3600)
 def get_logos_colors():
-    # Function to clean and validate hex color
-    def validate_color(color, default="#ffffff"):  # Default to white if color is invalid
-        if not color or not isinstance(color, str):
-            return default
-        color = color.lstrip("#")
-        if len(color) != 6 or not all(c in '0123456789abcdefABCDEF' for c in color):
-            return default
-        return f"#{color}"
-
+    # Colors come pre-validated from the shared palette
     with open('data/team_info.json', 'r') as file:
         data_dict = json.load(file)
 
-    colors_logos = [
-        {
+    colors_logos = []
+    for team in data_dict:
+        if not team.get('logos'):
+            continue
+        colors = team_colors(team['school'])
+        colors_logos.append({
             'id': team['id'],
             'school': team['school'],
             'mascot': team['mascot'],
             'logo': team['logos'][0] if isinstance(team['logos'], list) else team['logos'],
-            'color': validate_color(team.get('color', "#ffffff")),
-            'alt_color': validate_color(team.get('alternateColor', "#ffffff")),
-        }
-        for team in data_dict if team.get('logos')
-    ]
+            'color': colors['color'],
+            'alt_color': colors['alt_color'],
+        })
     for team in colors_logos:
         team['logo'] = team['logo'].replace('http://', 'https://')
     return colors_logos
 
 
-@cache.memoize(timeout=3600)
-def get_schedule():
-    querystring = {"year": YEAR}
+@memoize(timeout=3600)
+def get_schedule(year=YEAR):
+    # Past seasons come from the archive once saved
+    if str(year) != str(YEAR):
+        archived = store.load_calendar(year)
+        if archived is not None:
+            return archived
+    querystring = {"year": year}
     response = fetch_data_from_api(SCHEDULE_URL, query_params=querystring)
+    if response:
+        store.save_calendar(year, response)
     return response if response is not None else []
 
 
-@cache.memoize(timeout=3600)
-def get_games(week):
-    querystring = {"year": YEAR, "week": week, "division": "fbs"}
-    response = fetch_data_from_api(GAMES_URL, query_params=querystring)
+# Week dropdown options for a season, built once from the calendar. lastGameDate ('YYYY-MM-DD')
+# picks the default week
+@memoize(timeout=3600)
+def get_week_options(year=YEAR):
+    week_options = []
+    for week in get_schedule(year):
+        first_game_start = datetime.fromisoformat(week['firstGameStart'].replace('Z', '')).date()
+        last_game_start = datetime.fromisoformat(week['lastGameStart'].replace('Z', '')).date()
+        week_label = f"Week {week['week']} ({first_game_start.strftime('%b-%d')} - {last_game_start.strftime('%b-%d')})"
+        week_options.append({'label': week_label, 'value': week['week'], 'lastGameDate': last_game_start.isoformat()})
+    return week_options
+
+
+# Raw weekly responses, served from the archive once the week is final
+def fetch_week(table, url, week, year=YEAR, extra_params=None):
+    if week is not None and store.is_archived(year, week):
+        return store.load_week(table, year, week)
+    querystring = {"year": year, "week": week, **(extra_params or {})}
+    return fetch_data_from_api(url, query_params=querystring)
+
+
+def archive_week(week, year, games):
+    # Ingests a week that just went final so later loads make no upstream calls
+    lines = fetch_week('lines', ODDS_URL, week, year)
+    media = fetch_week('media', MEDIA_URL, week, year)
+    game_stats = fetch_week('game_stats', GAME_STATS_URL, week, year, {"classification": "fbs"})
+    rankings = fetch_rankings(week, year)
+    if lines is None or media is None or game_stats is None or rankings is None:
+        return  # Try again on the next refill rather than archiving a partial week
+    record_lines(week, year, lines)  # Closing lines end the week's line history
+    store.archive_week(year, week, games, lines, media, game_stats, rankings)
+
+
+@memoize(timeout=3600)
+def get_games(week, year=YEAR):
+    response = fetch_week('games', GAMES_URL, week, year, {"division": "fbs"})
+    if response is None:
+        return []
+    if week is not None and store.week_completed(response) and not store.is_archived(year, week):
+        archive_week(week, year, response)
+    return response
+
+
+@memoize(timeout=3600)
+def get_records(year=YEAR):
+    if str(year) != str(YEAR):
+        archived = store.load_records(year)
+        if archived:
+            return archived
+    response = fetch_records(year)
     return response if response is not None else []
 
 
-@cache.memoize(timeout=3600)
-def get_records():
-    querystring = {"year": YEAR}
+def fetch_records(year=YEAR):
+    querystring = {"year": year}
     response = fetch_data_from_api(RECORDS_URL, query_params=querystring)
-    return response if response is not None else []
+    if response:
+        store.save_records(year, response)
+    return response
 
 
-@cache.memoize(timeout=1800)
-def get_lines(week):
-    querystring = {"year": YEAR, "week": week}
-    response = fetch_data_from_api(ODDS_URL, query_params=querystring)
+@memoize(timeout=1800)
+def get_lines(week, year=YEAR):
+    response = fetch_week('lines', ODDS_URL, week, year)
     if response is not None:
+        if week is not None and not store.is_archived(year, week):
+            record_lines(week, year, response)
         betting_lines = [
-            {
-                'id': game['id'],
-                'spread': line['formattedSpread'],
-                'over_under': line['overUnder']
-            }
+            Line(id=game['id'], spread=line['formattedSpread'], over_under=line['overUnder'])
             for game in response
             for line in game.get('lines', [])
             if line.get('provider') == 'ESPN Bet'
@@ -118,27 +162,146 @@ def get_lines(week):
     return []
 
 
-@cache.memoize(timeout=3600)
-def get_media(week):
-    querystring = {"year": YEAR, "week": week}
-    response = fetch_data_from_api(MEDIA_URL, query_params=querystring)
+def record_lines(week, year, response):
+    # Appends every provider's lines that moved since the previous fetch to the week's history
+    def update(data):
+        history = LineHistory.from_bytes(data) if data else LineHistory(LINE_HISTORY_SIZE)
+        return history.to_bytes() if history.append(time.time(), response) else None
+    try:
+        store.update_line_history(year, week, update)
+    except Exception as e:
+        print(f"Error recording line history: {e}")
+
+
+def get_line_history(week, year=YEAR):
+    data = store.load_line_history(year, week)
+    return LineHistory.from_bytes(data) if data else None
+
+
+@memoize(timeout=3600)
+def get_media(week, year=YEAR):
+    response = fetch_week('media', MEDIA_URL, week, year)
     if response is not None:
         consolidated_media = {}
         for item in response:
             consolidated_media.setdefault(item['id'], []).append(item['outlet'])
-        return [{'id': k, 'outlet': ', '.join(v)} for k, v in consolidated_media.items()]
+        return [Media(id=k, outlet=', '.join(v)) for k, v in consolidated_media.items()]
     return []
 
 
-def get_scoreboard():
+# Polls published for a week, kept with the week's archive once it is final
+def fetch_rankings(week, year=YEAR):
+    if week is not None and store.is_archived(year, week):
+        archived = store.load_rankings(year, week)
+        if archived is not None:
+            return archived
+    return fetch_data_from_api(RANKINGS_URL, query_params={"year": year, "week": week})
+
+
+# Schools in the week's AP Top 25, or the first poll published if the AP poll is missing
+@memoize(timeout=3600)
+def get_ranked_teams(week, year=YEAR):
+    response = fetch_rankings(week, year)
+    if not response:
+        return []
+    polls = response[-1].get('polls', [])
+    poll = next((poll for poll in polls if poll['poll'] == 'AP Top 25'), polls[0] if polls else None)
+    return [rank['school'] for rank in poll['ranks']] if poll else []
+
+
+def fetch_scoreboard():
     querystring = {"classification": "fbs"}
     response = fetch_data_from_api(SCOREBOARD_URL, query_params=querystring)
-    return response if response is not None else []
+    return {'games': response} if response is not None else None
+
+
+# One worker per dyno polls the scoreboard and shares it; the others read the snapshot
+shared.register('scoreboard', fetch_scoreboard, refresh=SCOREBOARD_REFRESH)
+
+
+def get_scoreboard():
+    return shared.read('scoreboard', 'games', [])
+
+
+_live_records = {}
+
+
+def build_team_records():
+    # Registered after the scoreboard, so the writer applies a poll's finals right after fetching it.
+    # Rebased on a full records fetch every RECORDS_BASELINE_MAX_AGE to absorb anything missed
+    # while nobody was polling
+    live = _live_records.get('current')
+    if live is None or live.age() > RECORDS_BASELINE_MAX_AGE:
+        baseline = fetch_records(YEAR)
+        # Seeded from a scoreboard fetched right after the baseline rather than the shared one, which
+        # can predate it: a game that finished in between is in the baseline and must not count again
+        scoreboard = fetch_scoreboard() if baseline else None
+        if scoreboard is not None:
+            live = _live_records['current'] = LiveRecords(baseline, scoreboard['games'], team_conferences())
+            return {'teams': live.records}
+        if live is None:
+            return None
+    live.observe(get_scoreboard())
+    return {'teams': live.records}
+
+
+shared.register('team_records', build_team_records, refresh=SCOREBOARD_REFRESH)
+
+
+def season_records(year=YEAR):
+    # The current season's records follow the scoreboard; past seasons are final
+    if str(year) == str(YEAR):
+        teams = shared.read('team_records', 'teams')
+        if teams is not None:
+            return [TeamRecord(team, *record) for team, record in teams.items()]
+    return create_records(get_records(year))
+
+
+def load_stats(file_name):
+    # Team id (as a string) -> season stats row
+    with open(file_name, 'r') as file:
+        return {str(entry['id']): entry for entry in json.load(file)}
+
+
+# Fallback for get_team_stats until a week of the season is final
+shared.register('offense_stats', lambda: load_stats('data/offense_stats.json'))
+shared.register('defense_stats', lambda: load_stats('data/defense_stats.json'))
+
+
+@lru_cache(maxsize=None)
+def season_stats_engine(year=YEAR):
+    # One engine per season in the process that builds the snapshot; it keeps the weeks it has ingested
+    return SeasonStats(fbs_team_ids())
+
+
+def completed_weeks(year=YEAR):
+    for week in get_schedule(year):
+        if week.get('seasonType', 'regular') != 'regular' or to_timestamp(week['lastGameStart']) > time.time():
+            continue
+        if store.is_archived(year, week['week']) or store.week_completed(get_games(week['week'], year)):
+            yield week['week']
+
+
+def build_season_stats(year=YEAR):
+    # Ingests only the weeks that went final since the last refresh, then re-ranks every team
+    engine = season_stats_engine(str(year))
+    for week in completed_weeks(year):
+        if week not in engine.weeks:
+            game_stats = get_game_stats(week, year)
+            if game_stats:  # Retried on the next refresh if the upstream call failed
+                engine.ingest_week(week, game_stats)
+    return engine.records()
+
+
+shared.register('season_stats', build_season_stats, refresh=SEASON_STATS_REFRESH)
 
 
 def get_team_stats(stat_type, team):
-    file_name = 'data/offense_stats.json' if stat_type == "offense" else 'data/defense_stats.json'
-    team_data = load_team_data(file_name, team)
+    computed = shared.read('season_stats', str(team))
+    if computed is not None:
+        return computed[stat_type]
+
+    team_data = shared.read('offense_stats' if stat_type == "offense" else 'defense_stats', str(team))
     DEFAULT_STATS = {
         'total_rank': 0,
         'total_ypg': 0,
@@ -166,118 +329,140 @@ def get_team_stats(stat_type, team):
     }
 
 
-def get_game_stats(week):
-    querystring = {"year": YEAR, "week": week, "classification": "fbs"}
-    response = fetch_data_from_api(GAME_STATS_URL, query_params=querystring)
+def get_game_stats(week, year=YEAR):
+    response = fetch_week('game_stats', GAME_STATS_URL, week, year, {"classification": "fbs"})
     return response if response is not None else []
 
 
-@cache.memoize(timeout=3600)
+@memoize(timeout=3600)
 def create_records(records):
     return [
-        {
-            'team': record['team'],
-            'Total Wins': record['total'].get('wins', 0),
-            'Total Losses': record['total'].get('losses', 0),
-            'Conference Wins': record['conferenceGames'].get('wins', 0),
-            'Conference Losses': record['conferenceGames'].get('losses', 0),
-        }
+        TeamRecord(
+            team=record['team'],
+            total_wins=record['total'].get('wins', 0),
+            total_losses=record['total'].get('losses', 0),
+            conference_wins=record['conferenceGames'].get('wins', 0),
+            conference_losses=record['conferenceGames'].get('losses', 0),
+        )
         for record in records
     ]
 
 
-# Merges games data with logos and colors
-@cache.memoize(timeout=3600)
+# Fills in team mascots, logos and colors on the week's games
+@profiled('create_home_away_teams')
+@memoize(timeout=3600)
 def create_home_away_teams(games):
     team_info = get_logos_colors()
 
     # Create dictionaries for quick lookup by school name
-    team_data_by_school = {
-        team['school']: {'mascot': team['mascot'], 'logo': team['logo'], 'color': team.get('color', "#ffffff"), 'alt_color': team.get('alt_color', "#ffffff")}
-        for team in team_info
-    }
+    team_data_by_school = {team['school']: team for team in team_info}
 
-    games_with_logos = []
+    # The games are this call's own copies (memoized values are deserialized per call), so they are
+    # filled in place
     for game in games:
-        # Fetch home team logo and color
-        home_team_data = team_data_by_school.get(game['home_team'], {'mascot': 'N/A', 'logo': "N/A", 'color': "#ffffff"})
-        home_team_mascot = home_team_data['mascot']
-        home_team_logo = home_team_data['logo']
-        home_team_color = home_team_data['color']
-        home_team_alt_color = home_team_data['alt_color']
-
-        # Fetch away team logo and color
-        away_team_data = team_data_by_school.get(game['away_team'], {'mascot': 'N/A', 'logo': "N/A", 'color': "#ffffff"})
-        away_team_mascot = away_team_data['mascot']
-        away_team_logo = away_team_data['logo']
-        away_team_color = away_team_data['color']
-
-        # Combine game data with logos and colors
-        game_with_logos = {
-            **game,
-            'home_team_mascot': home_team_mascot,
-            'away_team_mascot': away_team_mascot,
-            'home_team_logo': home_team_logo,
-            'away_team_logo': away_team_logo,
-            'home_team_color': home_team_color,
-            'away_team_color': away_team_color,
-            'home_team_alt_color': home_team_alt_color,
-        }
-        games_with_logos.append(game_with_logos)
+        home_team_data = team_data_by_school.get(game.home_team)
+        if home_team_data:
+            game.home_team_mascot = home_team_data['mascot']
+            game.home_team_logo = home_team_data['logo']
+            game.home_team_color = home_team_data['color']
+            game.home_team_alt_color = home_team_data['alt_color']
+
+        away_team_data = team_data_by_school.get(game.away_team)
+        if away_team_data:
+            game.away_team_mascot = away_team_data['mascot']
+            game.away_team_logo = away_team_data['logo']
+            game.away_team_color = away_team_data['color']
+
+    return games
+
+
+# Cleans games data into Game records; kickoff is kept as epoch seconds and formatted per viewer
+# at render time
+@profiled('clean_games')
+@memoize(timeout=3600)
+def clean_games(games):
+    return [
+        Game(
+            id=game['id'],
+            start_timestamp=to_timestamp(game['start_date']),
+            home_team=game['home_team'],
+            home_id=game['home_id'],
+            away_team=game['away_team'],
+            away_id=game['away_id'],
+            home_points=game['home_points'],
+            home_line_scores=game['home_line_scores'],
+            away_points=game['away_points'],
+            completed=game['completed'],
+        )
+        for game in games
+    ]
 
-    return games_with_logos
 
+# Joins betting lines, media outlets and team records onto the week's games by id/school, in place
+def join_week_data(games, lines, media, team_records):
+    lines_by_id = {line.id: line for line in lines}
+    media_by_id = {item.id: item for item in media}
+    records_by_team = {record.team: record for record in team_records}
 
-# Cleans and formats games data
-@cache.memoize(timeout=3600)
-def clean_games(games):
-    cleaned_games = []
     for game in games:
-        start_date = datetime.fromisoformat(game['start_date']).astimezone(pytz.UTC)
-        start_date_est = start_date.astimezone(pytz.timezone('US/Eastern'))
-        game['start_date'] = start_date_est.strftime('%b-%d %I:%M %p')
-        game['day_of_week'] = start_date_est.strftime('%A')
-        cleaned_game = {
-            'id': game['id'],
-            'start_date': game['start_date'],
-            'day_of_week': game['day_of_week'],
-            'home_team': game['home_team'],
-            'home_id': game['home_id'],
-            'away_team': game['away_team'],
-            'away_id': game['away_id'],
-            'home_points': game['home_points'],
-            'home_line_scores': game['home_line_scores'],
-            'away_points': game['away_points'],
-            'completed': game['completed']
-        }
-        cleaned_games.append(cleaned_game)
-    return cleaned_games
+        line = lines_by_id.get(game.id)
+        if line:
+            game.spread, game.over_under = line.spread, line.over_under
+        outlets = media_by_id.get(game.id)
+        if outlets:
+            game.outlet = outlets.outlet
+        home_record = records_by_team.get(game.home_team)
+        if home_record:
+            game.home_total_wins, game.home_total_losses = home_record.total_wins, home_record.total_losses
+            game.home_conference_wins = home_record.conference_wins
+            game.home_conference_losses = home_record.conference_losses
+        away_record = records_by_team.get(game.away_team)
+        if away_record:
+            game.away_total_wins, game.away_total_losses = away_record.total_wins, away_record.total_losses
+            game.away_conference_wins = away_record.conference_wins
+            game.away_conference_losses = away_record.conference_losses
+    return games
+
+
+# The week's Game records with betting lines, media and team records joined on, shared by the week
+# list, its pager ticks, the filters and games-data. Kept for one scoreboard refresh so the current
+# season's records stay live
+@memoize(timeout=SCOREBOARD_REFRESH)
+def get_week_games(week, year=YEAR):
+    games = create_home_away_teams(clean_games(get_games(week, year)))
+    return join_week_data(games, get_lines(week, year), get_media(week, year), season_records(year))
 
 
 # Creates a scoreboard structure for display
 def create_scoreboard():
     scoreboard = get_scoreboard()
     return [
-        {
-            'game_id': game['id'],
-            'home_id': game['homeTeam']['id'],
-            'away_id': game['awayTeam']['id'],
-            'home_team': game['homeTeam']['name'],
-            'away_team': game['awayTeam']['name'],
-            'status': game['status'],
-            'period': game['period'],
-            'clock': game['clock'],
-            'tv': game['tv'],
-            'situation': game.get('situation'),
-            'possession': game['possession'],
-            'home_team_score': game['homeTeam']['points'],
-            'away_team_score': game['awayTeam']['points'],
-            'spread': game['betting']['spread'],
-        }
+        ScoreboardGame(
+            game_id=game['id'],
+            home_id=game['homeTeam']['id'],
+            away_id=game['awayTeam']['id'],
+            home_team=game['homeTeam']['name'],
+            away_team=game['awayTeam']['name'],
+            status=game['status'],
+            period=game['period'],
+            clock=game['clock'],
+            tv=game['tv'],
+            situation=game.get('situation'),
+            possession=game['possession'],
+            home_team_score=game['homeTeam']['points'],
+            away_team_score=game['awayTeam']['points'],
+            spread=game['betting']['spread'],
+        )
         for game in scoreboard
     ]
 
 
+# Ids of games in progress, used to list live games first; short timeout so it tracks the poller
+@memoize(timeout=30)
+def get_live_game_ids():
+    return [game.game_id for game in create_scoreboard() if game.status == 'in_progress']
+
+
 def create_game_stats(game_id, game_stats):
     # Find the game in the data by the specified game_id
     game_data = next((game for game in game_stats if game['id'] == game_id), None)
@@ -302,6 +487,7 @@ def create_game_stats(game_id, game_stats):
 
 
 # Improved function to create labeled comparison rows
+@profiled('create_comparison_row')
 def create_comparison_row(stat_name, description, home_value, away_value,
                           home_color, away_color, home_rank, away_rank, stat_type):
     # Convert possession time to seconds if stat_name is "possession"
@@ -384,7 +570,42 @@ def create_comparison_row(stat_name, description, home_value, away_value,
     ], style={"display": "flex", "alignItems": "center", "marginBottom": "5px"})
 
 
-def display_matchup(game_info):
+def _format_line(value, signed=False):
+    if value is None:
+        return "N/A"
+    return f"{value:+g}" if signed else f"{value:g}"
+
+
+# Opening -> current spread (home side) and total per provider, plus the consensus
+def create_line_movement(game_info, week, year=YEAR):
+    history = get_line_history(week, year) if week is not None else None
+    if history is None or not history.providers(game_info['id']):
+        return None
+    row_style = {"display": "flex", "justifyContent": "space-between", "fontSize": "12px", "marginBottom": "3px"}
+    rows = []
+    for provider in history.providers(game_info['id']):
+        opening = history.opening(game_info['id'], provider)
+        current = history.series(game_info['id'], provider)[-1]
+        rows.append(html.Div([
+            html.Span(provider, style={"fontWeight": "bold"}),
+            html.Span(f"{_format_line(opening['spread'], True)} → {_format_line(current['spread'], True)}"),
+            html.Span(f"O/U {_format_line(opening['over_under'])} → {_format_line(current['over_under'])}"),
+        ], style=row_style))
+    consensus = history.consensus(game_info['id'])
+    rows.append(html.Div([
+        html.Span(f"Consensus ({consensus['providers']})", style={"fontWeight": "bold"}),
+        html.Span(_format_line(consensus['spread'], True)),
+        html.Span(f"O/U {_format_line(consensus['over_under'])}"),
+    ], style=row_style))
+    return html.Div([
+        html.H3(f"Betting Lines ({game_info['home_team']} spread)",
+                style={"textAlign": "center", "fontSize": "14px", "fontWeight": "bold"}),
+        *rows,
+    ])
+
+
+@profiled('display_matchup')
+def display_matchup(game_info, week=None, year=YEAR):
     home_id = game_info['home_id']
     away_id = game_info['away_id']
     home_offense_stats = get_team_stats('offense', home_id)
@@ -406,12 +627,9 @@ def display_matchup(game_info):
         raise TypeError(
             f"away_offense_stats expected to be a dictionary, got {type(away_defense_stats)} instead.")
 
-    home_color = game_info['home_team_color']
-    away_color = game_info['away_team_color']
-    if color_similarity(home_color, away_color):
-        home_color = game_info['home_team_alt_color']
-    home_logo = game_info['home_team_logo']
-    away_logo = game_info['away_team_logo']
+    home_color, away_color = matchup_colors(game_info['home_team'], game_info['away_team'])
+    home_logo = logo_src(game_info['home_id'], 40)
+    away_logo = logo_src(game_info['away_id'], 40)
     layout = html.Div([
         # Offense Section with centered logos
         html.Div([
@@ -469,7 +687,10 @@ def display_matchup(game_info):
                                       home_defense_stats['scoring_rank'], away_defense_stats['scoring_rank'],
                                       'defense'),
             ]),
-        ], style={"marginBottom": "20px"})
+        ], style={"marginBottom": "20px"}),
+
+        # Line movement across providers
+        create_line_movement(game_info, week, year),
     ], style={
         "backgroundColor": "rgba(255, 255, 255, 0.8)",
         "borderRadius": "8px",
@@ -479,17 +700,15 @@ def display_matchup(game_info):
     return layout
 
 
-def display_results(week, game_info):
-    game_stats = get_game_stats(week)
+@profiled('display_results')
+def display_results(week, game_info, year=YEAR):
+    game_stats = get_game_stats(week, year)
     game_id = game_info['id']
     away_id = game_info['away_id']
     home_id = game_info['home_id']
-    home_color = game_info['home_team_color']
-    away_color = game_info['away_team_color']
-    if color_similarity(home_color, away_color):
-        home_color = game_info['home_team_alt_color']
-    home_logo = game_info['home_team_logo']
-    away_logo = game_info['away_team_logo']
+    home_color, away_color = matchup_colors(game_info['home_team'], game_info['away_team'])
+    home_logo = logo_src(game_info['home_id'], 40)
+    away_logo = logo_src(game_info['away_id'], 40)
     for game in game_stats:
         if game['id'] == game_id:
             home_team_stats, away_team_stats = create_game_stats(game_id, game_stats)
@@ -553,8 +772,8 @@ def display_results(week, game_info):
 
 
 # Boxscore Functions
-def display_boxscore(game_id, game_info):
-    data = get_games()
+def display_boxscore(game_id, game_info, week, year=YEAR):
+    data = get_games(week, year)
     boxscores = create_linescores(data)
 
     if game_id not in boxscores:
@@ -607,8 +826,8 @@ def generate_quarter_headers(max_quarters):
 def create_team_rows(game_id, game_info, boxscores):
     home_team = game_info['home_team']
     away_team = game_info['away_team']
-    home_logo = game_info['home_team_logo']
-    away_logo = game_info['away_team_logo']
+    home_logo = logo_src(game_info['home_id'], 50)
+    away_logo = logo_src(game_info['away_id'], 50)
     home_mascot = game_info['home_team_mascot']
     away_mascot = game_info['away_team_mascot']
     away_score = boxscores[game_id]['away_points']
@@ -0,0 +1,202 @@
+# warmstart.py
+# Warm restarts. The worker that owns the shared snapshots (see shared.py) periodically writes the
+# app's computed state to WARM_SNAPSHOT_PATH, which can sit on a mounted volume. The state covers
+# every live memoized value in the cache directory (enriched week views, schedule and week options,
+# records, rankings) and the shared snapshots (team data, last scoreboard).
+# At boot, after the cache is cleared, the snapshot is restored before the worker serves traffic,
+# so a daily dyno restart doesn't start from a cold cache.
+# The file is versioned by format and by a hash of the app's source, checksummed, and ignored
+# once older than WARM_SNAPSHOT_MAX_AGE.
+import atexit
+import glob
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from functools import lru_cache
+from cache_config import cache
+from config import SHARED_DIR, WARM_SNAPSHOT_PATH, WARM_SNAPSHOT_INTERVAL, WARM_SNAPSHOT_MAX_AGE
+import shared
+
+MAGIC = b'CFBWARM1'
+FORMAT_VERSION = 1
+# magic, format version, created_at, source hash, payload length, payload sha256
+HEADER = struct.Struct('<8sHd16sQ32s')
+# Per entry: kind, name length, data length
+ENTRY = struct.Struct('<BHI')
+CACHE_ENTRY, SHARED_ENTRY = 1, 2
+# FileSystemCache names entry files by the md5 of their key; anything else is bookkeeping
+CACHE_FILE = re.compile(r'^[0-9a-f]{32}$')
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@lru_cache(maxsize=None)
+def source_version():
+    # Memoized values are only reusable by the same code that computed them
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(APP_DIR, '*.py'))):
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.digest()[:16]
+
+
+def _cache_dir():
+    return cache.config['CACHE_DIR']
+
+
+def _collect():
+    # (kind, name, data) for every unexpired cache entry and every shared snapshot
+    now = time.time()
+    entries = []
+    for name in os.listdir(_cache_dir()):
+        if not CACHE_FILE.match(name):
+            continue
+        try:
+            with open(os.path.join(_cache_dir(), name), 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            continue  # Expired and removed while we were listing
+        expires = struct.unpack_from('I', data)[0] if len(data) >= 4 else None
+        if expires is not None and (expires == 0 or expires >= now):
+            entries.append((CACHE_ENTRY, name, data))
+    for path in glob.glob(os.path.join(SHARED_DIR, '*.snap')):
+        try:
+            with open(path, 'rb') as file:
+                entries.append((SHARED_ENTRY, os.path.basename(path), file.read()))
+        except FileNotFoundError:
+            continue
+    return entries
+
+
+def write_snapshot(path=WARM_SNAPSHOT_PATH):
+    entries = _collect()
+    chunks = []
+    for kind, name, data in entries:
+        encoded = name.encode()
+        chunks.append(ENTRY.pack(kind, len(encoded), len(data)))
+        chunks.append(encoded)
+        chunks.append(data)
+    payload = zlib.compress(b''.join(chunks), 6)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, time.time(), source_version(), len(payload),
+                         hashlib.sha256(payload).digest())
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as file:
+        file.write(header)
+        file.write(payload)
+    os.replace(tmp, path)
+    return len(entries)
+
+
+def _read(path):
+    # Entries of a valid, current snapshot, or None with the reason printed
+    try:
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+            payload = file.read()
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER.size:
+        print(f"Warm snapshot {path} is truncated; starting cold")
+        return None
+    magic, version, created_at, source, length, checksum = HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        print(f"Warm snapshot {path} has an unknown format; starting cold")
+        return None
+    if source != source_version():
+        print(f"Warm snapshot {path} was written by different code; starting cold")
+        return None
+    age = time.time() - created_at
+    if age > WARM_SNAPSHOT_MAX_AGE:
+        print(f"Warm snapshot {path} is {age / 3600:.1f}h old; starting cold")
+        return None
+    if len(payload) != length or hashlib.sha256(payload).digest() != checksum:
+        print(f"Warm snapshot {path} failed its checksum; starting cold")
+        return None
+
+    data = zlib.decompress(payload)
+    entries, offset = [], 0
+    while offset < len(data):
+        kind, name_length, data_length = ENTRY.unpack_from(data, offset)
+        offset += ENTRY.size
+        name = data[offset:offset + name_length].decode()
+        offset += name_length
+        entries.append((kind, name, data[offset:offset + data_length]))
+        offset += data_length
+    return entries
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as file:
+        file.write(data)
+    os.replace(tmp, path)
+
+
+def restore_snapshot(path=WARM_SNAPSHOT_PATH):
+    entries = _read(path)
+    if not entries:
+        return 0
+    os.makedirs(_cache_dir(), exist_ok=True)
+    os.makedirs(SHARED_DIR, exist_ok=True)
+    now = time.time()
+    restored = 0
+    for kind, name, data in entries:
+        if kind == CACHE_ENTRY:
+            # Entries that expired while the dyno was down are dropped
+            expires = struct.unpack_from('I', data)[0]
+            if expires != 0 and expires < now:
+                continue
+            _write_atomic(os.path.join(_cache_dir(), name), data)
+        elif kind == SHARED_ENTRY:
+            target = os.path.join(SHARED_DIR, name)
+            if os.path.exists(target):
+                continue  # Another worker already published a fresher one
+            _write_atomic(target, data)
+        restored += 1
+    print(f"Restored {restored} entries from warm snapshot {path}")
+    return restored
+
+
+def _recount(server):
+    # Restored files bypass FileSystemCache.set, so its file count (which drives threshold
+    # pruning) is reset to what is on disk
+    with server.app_context():
+        count = sum(1 for name in os.listdir(_cache_dir()) if CACHE_FILE.match(name))
+        cache.cache._update_count(value=count)
+
+
+def _save():
+    try:
+        write_snapshot()
+    except OSError as e:
+        print(f"Error writing warm snapshot: {e}")
+
+
+def _save_on_exit():
+    # One last snapshot when the writer shuts down (dynos get SIGTERM before a restart)
+    if shared.is_writer():
+        _save()
+
+
+def _snapshot_loop():
+    while True:
+        time.sleep(WARM_SNAPSHOT_INTERVAL)
+        if shared.is_writer():
+            _save()
+
+
+def init_warmstart(server):
+    # Call after the boot-time cache.clear()
+    if not WARM_SNAPSHOT_PATH:
+        return
+    # The cache directory and shared snapshots belong to the whole dyno; they are restored once per
+    # boot, not by a worker respawned mid-day, which would roll them back to the last snapshot
+    if shared.first_boot():
+        restore_snapshot()
+        _recount(server)
+    threading.Thread(target=_snapshot_loop, name='warm-snapshot-writer', daemon=True).start()
+    atexit.register(_save_on_exit)